@@ -14,6 +14,10 @@ if (Test-Path "dist") {
     Remove-Item -Recurse -Force "dist"
 }
 
+# Precompile sources so bytecode is fresh before packaging
+Write-Host "Compiling Python sources..." -ForegroundColor Green
+python -m compileall -q src skills main.py
+
 # Run PyInstaller
 Write-Host "Running PyInstaller..." -ForegroundColor Green
 pyinstaller openNova.spec
@@ -3,14 +3,23 @@ openNova Enterprise Desktop Assistant
 Main entry point with Admin elevation support
 """
 import ctypes
+import functools
 import sys
 import os
 
+# Resolve shell32 once; it only exists on Windows
+try:
+    _shell32 = ctypes.windll.shell32
+    _shell32.IsUserAnAdmin.restype = ctypes.c_int
+except (AttributeError, OSError):
+    _shell32 = None
 
+
+@functools.lru_cache(maxsize=1)
 def is_admin():
     """Check if the script is running with admin privileges."""
     try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
+        return _shell32.IsUserAnAdmin() != 0
     except:
         return False
 
@@ -26,7 +35,7 @@ def run_as_admin():
     
     try:
         # ShellExecuteW returns a value > 32 on success
-        ret = ctypes.windll.shell32.ShellExecuteW(
+        ret = _shell32.ShellExecuteW(
             None, "runas", sys.executable, params, None, 1
         )
         return ret > 32
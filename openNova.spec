@@ -78,6 +78,13 @@ a = Analysis(
         'src.scheduler',
         'src.watcher',
         'src.utils',
+
+        # Loaded lazily by src.actions.executor
+        'src.actions.input_simulator',
+        'src.actions.shell',
+        'src.actions.macro_recorder',
+        'src.vision.accessibility',
+        'src.vision.analyzer',
     ],
     hookspath=[],
     hooksconfig={},
@@ -15,6 +15,8 @@ class WeatherSkill(Skill):
     In a real implementation, this would call a weather API.
     """
     
+    keywords = ["weather", "temperature", "forecast", "rain", "sunny", "cloudy"]
+    
     @property
     def name(self) -> str:
         return "WeatherSkill"
@@ -35,9 +37,7 @@ class WeatherSkill(Skill):
         """
         Check if the input is asking for weather information.
         """
-        weather_keywords = ["weather", "temperature", "forecast", "rain", "sunny", "cloudy"]
-        user_input_lower = user_input.lower()
-        return any(keyword in user_input_lower for keyword in weather_keywords)
+        return self.matches_keywords(user_input)
     
     def execute(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
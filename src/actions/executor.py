@@ -3,15 +3,28 @@ Action Executor - Executes action plans.
 """
 import logging
 import time
-from typing import List, Dict, Any
-from src.actions.input_simulator import input_sim
-from src.actions.shell import shell_executor
-from src.actions.macro_recorder import macro_recorder
-from src.vision.accessibility import accessibility
-from src.vision.analyzer import vision_analyzer
+from typing import List, Dict, Any, Optional
+from src.utils.lazy import LazyProxy
+
+# Heavy singletons (pyautogui, pywinauto, pynput, LLM) load on first use
+input_sim = LazyProxy("src.actions.input_simulator", "input_sim")
+shell_executor = LazyProxy("src.actions.shell", "shell_executor")
+macro_recorder = LazyProxy("src.actions.macro_recorder", "macro_recorder")
+accessibility = LazyProxy("src.vision.accessibility", "accessibility")
+vision_analyzer = LazyProxy("src.vision.analyzer", "vision_analyzer")
 
 logger = logging.getLogger("Executor")
 
+# Actions that don't change UI layout, so the next step needn't wait for it to settle
+_NO_WAIT_ACTIONS = {"type", "key", "wait"}
+
+# Upper bound on the post-action UI settle wait
+_SETTLE_TIMEOUT = 0.5
+
+# Actions that may replace the foreground window's contents wholesale, so
+# the element snapshot is dropped after them
+_UI_REPLACING_ACTIONS = {"open", "shell"}
+
 
 class ActionExecutor:
     """Executes action plans from the planner."""
@@ -23,6 +36,26 @@ class ActionExecutor:
         self.accessibility = accessibility
         self.vision = vision_analyzer
         
+        # Foreground window's UI elements, indexed by casefolded name
+        self._ui_index: Dict[str, Dict[str, Any]] = {}
+        self._ui_elements: List[Dict[str, Any]] = []
+        self._ui_index_hwnd = None
+        
+        # Action type -> handler
+        self._dispatch = {
+            "click": self._action_click,
+            "type": self._action_type,
+            "key": self._action_key,
+            "shell": self._action_shell,
+            "open": self._action_open,
+            "wait": self._action_wait,
+            "move": self._action_move,
+            "scroll": self._action_scroll,
+            "macro_record_start": self._action_macro_record_start,
+            "macro_record_stop": self._action_macro_record_stop,
+            "macro_replay": self._action_macro_replay,
+        }
+        
         logger.info("Action executor initialized")
     
     def execute_plan(self, plan: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -39,27 +72,36 @@ class ActionExecutor:
             logger.warning("Empty plan provided")
             return {"success": False, "message": "Empty plan"}
         
-        logger.info(f"Executing plan with {len(plan)} steps")
+        logger.info("Executing plan with %s steps", len(plan))
+        
+        # Windows may have moved or re-laid out since the last plan
+        self._invalidate_ui_index()
         
         results = []
+        last_step = len(plan) - 1
         
         for i, action in enumerate(plan):
-            logger.info(f"Step {i+1}/{len(plan)}: {action.get('action', 'unknown')}")
+            logger.info("Step %s/%s: %s", i+1, len(plan), action.get('action', 'unknown'))
             
+            action_type = str(action.get("action", "")).lower()
             try:
                 result = self._execute_action(action)
                 results.append(result)
                 
                 if not result.get("success", False):
-                    logger.warning(f"Step {i+1} failed: {result.get('message', 'Unknown error')}")
+                    logger.warning("Step %s failed: %s", i+1, result.get('message', 'Unknown error'))
                     # Continue anyway unless it's critical
                 
-                # Brief delay between actions
-                time.sleep(0.5)
+                # Let the UI settle before the next step
+                if i < last_step and action_type not in _NO_WAIT_ACTIONS:
+                    self.accessibility.wait_for_idle(timeout=_SETTLE_TIMEOUT)
                 
             except Exception as e:
-                logger.error(f"Error executing step {i+1}: {e}")
+                logger.error("Error executing step %s: %s", i+1, e)
                 results.append({"success": False, "message": str(e)})
+            
+            if action_type in _UI_REPLACING_ACTIONS:
+                self._invalidate_ui_index()
         
         # Summarize results
         success_count = sum(1 for r in results if r.get("success", False))
@@ -82,43 +124,13 @@ class ActionExecutor:
             Result dictionary
         """
         action_type = action.get("action", "").lower()
+        handler = self._dispatch.get(action_type)
         
-        if action_type == "click":
-            return self._action_click(action)
-        
-        elif action_type == "type":
-            return self._action_type(action)
-        
-        elif action_type == "key":
-            return self._action_key(action)
-        
-        elif action_type == "shell":
-            return self._action_shell(action)
-        
-        elif action_type == "open":
-            return self._action_open(action)
-        
-        elif action_type == "wait":
-            return self._action_wait(action)
-        
-        elif action_type == "move":
-            return self._action_move(action)
-        
-        elif action_type == "scroll":
-            return self._action_scroll(action)
-
-        elif action_type == "macro_record_start":
-            return self._action_macro_record_start(action)
-
-        elif action_type == "macro_record_stop":
-            return self._action_macro_record_stop(action)
-
-        elif action_type == "macro_replay":
-            return self._action_macro_replay(action)
-        
-        else:
-            logger.warning(f"Unknown action type: {action_type}")
+        if handler is None:
+            logger.warning("Unknown action type: %s", action_type)
             return {"success": False, "message": f"Unknown action: {action_type}"}
+        
+        return handler(action)
     
     def _action_click(self, action: Dict[str, Any]) -> Dict[str, Any]:
         """Execute click action."""
@@ -126,7 +138,7 @@ class ActionExecutor:
         
         # Try to find element by name using accessibility API
         if isinstance(target, str):
-            element = self.accessibility.find_element_by_name(target)
+            element = self._find_ui_element(target)
             
             if element:
                 x = element.get("center_x", 0)
@@ -155,6 +167,62 @@ class ActionExecutor:
             "coordinates": [x, y]
         }
     
+    def _find_ui_element(self, name: str) -> Optional[Dict[str, Any]]:
+        """Find an element in the foreground window, reusing its UI snapshot."""
+        hwnd = self.accessibility.get_foreground_handle()
+        if hwnd is None:
+            return self.accessibility.find_element_by_name(name)
+        
+        rebuilt = hwnd != self._ui_index_hwnd
+        if rebuilt:
+            self._rebuild_ui_index(hwnd)
+        
+        element = self._lookup_ui_element(name)
+        if rebuilt:
+            return element
+        
+        if element is None or not self._element_still_there(element):
+            # The window moved, scrolled or re-laid out since the snapshot
+            self._rebuild_ui_index(hwnd)
+            element = self._lookup_ui_element(name)
+        
+        return element
+    
+    def _element_still_there(self, element: Dict[str, Any]) -> bool:
+        """Hit-test a cached element's center; one probe instead of a tree walk."""
+        name = element.get("name", "")
+        probed = self.accessibility.get_elements_at_point(
+            element.get("center_x", 0), element.get("center_y", 0)
+        )
+        return any(hit and hit.get("name", "") == name for hit in probed)
+    
+    def _invalidate_ui_index(self):
+        """Drop the UI snapshot so the next lookup walks the tree again."""
+        self._ui_index_hwnd = None
+        self._ui_index = {}
+        self._ui_elements = []
+    
+    def _rebuild_ui_index(self, hwnd: int):
+        """Snapshot the foreground window's UI tree once."""
+        self._ui_elements = self.accessibility.get_window_elements()
+        self._ui_index = {}
+        for elem in self._ui_elements:
+            self._ui_index.setdefault(elem.get("name", "").casefold(), elem)
+        self._ui_index_hwnd = hwnd
+    
+    def _lookup_ui_element(self, name: str) -> Optional[Dict[str, Any]]:
+        """Exact name match first, then the same partial match as find_element_by_name."""
+        key = name.casefold()
+        element = self._ui_index.get(key)
+        if element is not None:
+            return element
+        
+        for elem in self._ui_elements:
+            if key in elem.get("name", "").casefold():
+                return elem
+        
+        return None
+    
     def _action_type(self, action: Dict[str, Any]) -> Dict[str, Any]:
         """Execute type action."""
         text = action.get("value", "")
@@ -189,6 +257,9 @@ class ActionExecutor:
         if not command:
             return {"success": False, "message": "No command specified"}
         
+        if isinstance(command, list):
+            return self._action_shell_batch(command, action.get("shell", "powershell"))
+        
         # Execute via PowerShell
         code, stdout, stderr = self.shell.execute_powershell(command)
         
@@ -202,6 +273,20 @@ class ActionExecutor:
             "return_code": code
         }
     
+    def _action_shell_batch(self, commands: List[str], shell: str) -> Dict[str, Any]:
+        """Run several commands in order, stopping at the first failure."""
+        commands = [str(command) for command in commands]
+        step_results = self.shell.execute_batch(commands, shell=shell)
+        
+        return {
+            "success": len(step_results) == len(commands) and all(code == 0 for code, _, _ in step_results),
+            "message": f"Executed {len(step_results)}/{len(commands)} commands",
+            "steps": [
+                {"command": command, "return_code": code, "output": stdout, "error": stderr}
+                for command, (code, stdout, stderr) in zip(commands, step_results)
+            ]
+        }
+    
     def _action_open(self, action: Dict[str, Any]) -> Dict[str, Any]:
         """Execute open application action."""
         app = action.get("target", "") or action.get("value", "")
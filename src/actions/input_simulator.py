@@ -4,6 +4,7 @@ Input Simulator - Controls mouse and keyboard.
 import logging
 import time
 from typing import Tuple, List
+from src.actions import send_input
 
 logger = logging.getLogger("InputSim")
 
@@ -21,6 +22,21 @@ class InputSimulator:
             import pyautogui
             # Disable fail-safe for automation
             pyautogui.FAILSAFE = False
+            # No implicit 0.1s pause after every primitive
+            pyautogui.PAUSE = 0
+
+            # Bind hot functions once so actions skip the import machinery
+            self._pg = pyautogui
+            self._click = pyautogui.click
+            self._moveTo = pyautogui.moveTo
+            self._dragTo = pyautogui.dragTo
+            self._write = pyautogui.write
+            self._press = pyautogui.press
+            self._hotkey = pyautogui.hotkey
+            self._scroll = pyautogui.scroll
+            self._position = pyautogui.position
+            self._screenshot = pyautogui.screenshot
+
             logger.info("Input simulator initialized")
             return True
         except ImportError:
@@ -42,13 +58,16 @@ class InputSimulator:
             return
         
         try:
-            import pyautogui
+            logger.info("Clicking at (%s, %s) with %s button", x, y, button)
             
-            logger.info(f"Clicking at ({x}, {y}) with {button} button")
-            pyautogui.click(x, y, clicks=clicks, interval=interval, button=button)
+            # One SendInput call for move + all clicks when no spacing is needed
+            if interval <= 0 and send_input.click(x, y, button=button, clicks=clicks):
+                return
+            
+            self._click(x, y, clicks=clicks, interval=interval, button=button)
             
         except Exception as e:
-            logger.error(f"Error clicking: {e}")
+            logger.error("Error clicking: %s", e)
     
     def move_to(self, x: int, y: int, duration: float = 0.5, smooth: bool = True):
         """
@@ -63,18 +82,16 @@ class InputSimulator:
             return
         
         try:
-            import pyautogui
-            
             if smooth:
                 # Use tweening for smooth movement
-                pyautogui.moveTo(x, y, duration=duration, tween=pyautogui.easeOutQuad)
+                self._moveTo(x, y, duration=duration, tween=self._pg.easeOutQuad)
             else:
-                pyautogui.moveTo(x, y, duration=duration)
+                self._moveTo(x, y, duration=duration)
             
-            logger.debug(f"Moved to ({x}, {y})")
+            logger.debug("Moved to (%s, %s)", x, y)
             
         except Exception as e:
-            logger.error(f"Error moving mouse: {e}")
+            logger.error("Error moving mouse: %s", e)
     
     def drag_to(self, x: int, y: int, duration: float = 1.0, button: str = "left"):
         """
@@ -89,15 +106,13 @@ class InputSimulator:
             return
         
         try:
-            import pyautogui
-            
-            logger.info(f"Dragging to ({x}, {y})")
-            pyautogui.dragTo(x, y, duration=duration, button=button)
+            logger.info("Dragging to (%s, %s)", x, y)
+            self._dragTo(x, y, duration=duration, button=button)
             
         except Exception as e:
-            logger.error(f"Error dragging: {e}")
+            logger.error("Error dragging: %s", e)
     
-    def type_text(self, text: str, interval: float = 0.05):
+    def type_text(self, text: str, interval: float = 0.0):
         """
         Type text.
         
@@ -109,13 +124,20 @@ class InputSimulator:
             return
         
         try:
-            import pyautogui
+            logger.info("Typing text: %s...", text[:50])
+            
+            # Whole string as batched Unicode key events instead of per-char writes
+            typed, delivered = send_input.type_text(text, interval=interval)
+            if typed:
+                return
             
-            logger.info(f"Typing text: {text[:50]}...")
-            pyautogui.write(text, interval=interval)
+            # Resume after whatever SendInput already injected
+            remaining = text.replace("\r\n", "\n")[delivered:]
+            if remaining:
+                self._write(remaining, interval=interval)
             
         except Exception as e:
-            logger.error(f"Error typing text: {e}")
+            logger.error("Error typing text: %s", e)
     
     def press_key(self, key: str, presses: int = 1, interval: float = 0.0):
         """
@@ -130,13 +152,11 @@ class InputSimulator:
             return
         
         try:
-            import pyautogui
-            
-            logger.info(f"Pressing key: {key}")
-            pyautogui.press(key, presses=presses, interval=interval)
+            logger.info("Pressing key: %s", key)
+            self._press(key, presses=presses, interval=interval)
             
         except Exception as e:
-            logger.error(f"Error pressing key: {e}")
+            logger.error("Error pressing key: %s", e)
     
     def hotkey(self, *keys):
         """
@@ -149,13 +169,11 @@ class InputSimulator:
             return
         
         try:
-            import pyautogui
-            
-            logger.info(f"Pressing hotkey: {'+'.join(keys)}")
-            pyautogui.hotkey(*keys)
+            logger.info("Pressing hotkey: %s", '+'.join(keys))
+            self._hotkey(*keys)
             
         except Exception as e:
-            logger.error(f"Error pressing hotkey: {e}")
+            logger.error("Error pressing hotkey: %s", e)
     
     def scroll(self, clicks: int, direction: str = "down"):
         """
@@ -169,16 +187,14 @@ class InputSimulator:
             return
         
         try:
-            import pyautogui
-            
             if direction == "down" and clicks > 0:
                 clicks = -clicks
             
-            logger.info(f"Scrolling {abs(clicks)} clicks {direction}")
-            pyautogui.scroll(clicks)
+            logger.info("Scrolling %s clicks %s", abs(clicks), direction)
+            self._scroll(clicks)
             
         except Exception as e:
-            logger.error(f"Error scrolling: {e}")
+            logger.error("Error scrolling: %s", e)
     
     def get_mouse_position(self) -> Tuple[int, int]:
         """
@@ -191,8 +207,7 @@ class InputSimulator:
             return (0, 0)
         
         try:
-            import pyautogui
-            return pyautogui.position()
+            return self._position()
         except:
             return (0, 0)
     
@@ -212,9 +227,7 @@ class InputSimulator:
             return None
         
         try:
-            import pyautogui
-            
-            screenshot = pyautogui.screenshot(region=(x, y, width, height))
+            screenshot = self._screenshot(region=(x, y, width, height))
             
             if filename:
                 screenshot.save(filename)
@@ -223,7 +236,7 @@ class InputSimulator:
             return screenshot
             
         except Exception as e:
-            logger.error(f"Error taking screenshot: {e}")
+            logger.error("Error taking screenshot: %s", e)
             return None
 
 
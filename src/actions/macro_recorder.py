@@ -1,15 +1,136 @@
 """
 Macro recorder for imitation learning: record and replay user interactions.
 """
+import ctypes
+import heapq
 import json
 import logging
+import threading
 import time
+from collections import deque
+from ctypes import wintypes
+from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
-from threading import Lock
-from typing import Dict, Any, List, Optional
+from threading import Thread
+from typing import Callable, Dict, Any, Iterator, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger("MacroRecorder")
 
+# Mouse moves closer together than this are coalesced into one event (~60 Hz)
+MOUSE_MOVE_INTERVAL = 1.0 / 60
+
+_timestamp_of = attrgetter("timestamp")
+
+# Replay sleeps until this close to an event's deadline, then spins the rest
+REPLAY_SPIN_SECONDS = 0.001
+
+# Compact event (de)serialization: orjson when installed, stdlib json otherwise
+if orjson is not None:
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    _loads = json.loads
+
+
+# Compact records staged by listener callbacks; expanded to dicts only when
+# written, which keeps per-event allocation low during dense mouse streams.
+@dataclass(slots=True)
+class MouseMove:
+    timestamp: float
+    x: int
+    y: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": "mouse_move", "x": self.x, "y": self.y, "timestamp": self.timestamp}
+
+
+@dataclass(slots=True)
+class MouseClick:
+    timestamp: float
+    x: int
+    y: int
+    button: str
+    pressed: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": "mouse_click",
+            "x": self.x,
+            "y": self.y,
+            "button": self.button,
+            "pressed": self.pressed,
+            "timestamp": self.timestamp,
+        }
+
+
+@dataclass(slots=True)
+class MouseScroll:
+    timestamp: float
+    x: int
+    y: int
+    dx: int
+    dy: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": "mouse_scroll",
+            "x": self.x,
+            "y": self.y,
+            "dx": self.dx,
+            "dy": self.dy,
+            "timestamp": self.timestamp,
+        }
+
+
+@dataclass(slots=True)
+class KeyEvent:
+    timestamp: float
+    pressed: bool
+    kind: str
+    value: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": "key_press" if self.pressed else "key_release",
+            "key": {"kind": self.kind, "value": self.value},
+            "timestamp": self.timestamp,
+        }
+
+
+def _noop(*args, **kwargs):
+    """Stand-in listener sink while not recording."""
+
+
+# Reused per thread so window lookups don't allocate a buffer per call
+TITLE_BUFFER_CHARS = 512
+CLASS_BUFFER_CHARS = 256
+_buffers = threading.local()
+
+
+def _title_buffer(length: int):
+    buf = getattr(_buffers, "title", None)
+    if buf is None or len(buf) < length:
+        buf = ctypes.create_unicode_buffer(max(length, TITLE_BUFFER_CHARS))
+        _buffers.title = buf
+    return buf
+
+
+def _class_buffer():
+    buf = getattr(_buffers, "cls", None)
+    if buf is None:
+        buf = ctypes.create_unicode_buffer(CLASS_BUFFER_CHARS)
+        _buffers.cls = buf
+    return buf
+
 
 class MacroRecorder:
     """Records and replays mouse/keyboard events."""
@@ -17,7 +138,6 @@ class MacroRecorder:
     def __init__(self):
         self.recording = False
         self.start_ts = 0.0
-        self.events: List[Dict[str, Any]] = []
         self.current_macro_name = ""
         self.output_dir = Path.home() / ".openNova" / "macros"
         self.output_dir.mkdir(parents=True, exist_ok=True)
@@ -27,9 +147,31 @@ class MacroRecorder:
         self.mouse_controller = None
         self.keyboard_controller = None
 
-        self._lock = Lock()
+        # Events are streamed to disk as JSONL; only a count and the pending
+        # (not yet coalesced) mouse move are kept in memory.
+        self._events_fp = None
+        self._event_count = 0
+        self._pending_move: Optional[MouseMove] = None
+
+        # Listener threads stage events here without locking (deque.append is
+        # atomic); a single drain thread does context capture and file I/O.
+        self._mouse_queue = deque()
+        self._key_queue = deque()
+        self._drain_thread: Optional[Thread] = None
+
+        # Listener callbacks feed events through this; swapped to _noop when
+        # not recording so the hot path carries no recording-flag check.
+        self._stage = _noop
+
         self.available = self._check_dependencies()
 
+        # Foreground window cache: UI context is only re-queried when the HWND changes
+        self._user32 = self._load_user32()
+        self._last_hwnd = None
+        self._last_ctx: Dict[str, Any] = {}
+        self._seen_hwnds = set()
+        self._last_move_ts = 0.0
+
     def _check_dependencies(self) -> bool:
         try:
             from pynput import keyboard, mouse
@@ -40,48 +182,151 @@ class MacroRecorder:
             self.keyboard_controller = keyboard.Controller()
             return True
         except Exception as error:
-            logger.warning(f"Macro recorder unavailable: {error}")
+            logger.warning("Macro recorder unavailable: %s", error)
             return False
 
+    def _load_user32(self):
+        try:
+            user32 = ctypes.WinDLL("user32")
+        except (AttributeError, OSError):
+            return None
+
+        # Explicit prototypes skip ctypes' generic argument conversion
+        user32.GetForegroundWindow.argtypes = []
+        user32.GetForegroundWindow.restype = wintypes.HWND
+        user32.GetWindowTextLengthW.argtypes = [wintypes.HWND]
+        user32.GetWindowTextLengthW.restype = ctypes.c_int
+        user32.GetWindowTextW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        user32.GetWindowTextW.restype = ctypes.c_int
+        user32.GetClassNameW.argtypes = [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int]
+        user32.GetClassNameW.restype = ctypes.c_int
+        return user32
+
+    def _load_winmm(self):
+        try:
+            return ctypes.windll.winmm
+        except (AttributeError, OSError):
+            return None
+
     def _now(self) -> float:
         return max(0.0, time.time() - self.start_ts)
 
-    def _serialize_key(self, key) -> Dict[str, Any]:
+    def _serialize_key(self, key) -> Tuple[str, str]:
+        """Return the (kind, value) pair used to rebuild a key on replay."""
         if hasattr(key, "char") and key.char is not None:
-            return {"kind": "char", "value": key.char}
-        return {"kind": "special", "value": str(key).replace("Key.", "")}
+            return "char", key.char
+        return "special", str(key).replace("Key.", "")
 
     def _capture_ui_context(self) -> Dict[str, Any]:
+        user32 = self._user32
+        hwnd = user32.GetForegroundWindow() if user32 else None
+        if hwnd == self._last_hwnd and self._last_ctx:
+            return self._last_ctx
+
         context = {
             "window_title": "",
-            "window_handle": None,
+            "window_handle": int(hwnd) if hwnd else None,
             "window_class": "",
             "automation_id": "",
         }
 
+        if hwnd:
+            try:
+                title_buf = _title_buffer(user32.GetWindowTextLengthW(hwnd) + 1)
+                title_len = user32.GetWindowTextW(hwnd, title_buf, len(title_buf))
+                class_buf = _class_buffer()
+                class_len = user32.GetClassNameW(hwnd, class_buf, len(class_buf))
+                context["window_title"] = title_buf[:title_len]
+                context["window_class"] = class_buf[:class_len]
+            except Exception:
+                pass
+            self._seen_hwnds.add(int(hwnd))
+
+        self._last_hwnd = hwnd
+        self._last_ctx = context
+        return context
+
+    def _resolve_automation_ids(self) -> Dict[int, str]:
+        """Look up UIA automation ids once per distinct window seen while recording."""
+        automation_ids: Dict[int, str] = {}
+        if not self._seen_hwnds:
+            return automation_ids
+
         try:
             from pywinauto import Desktop
 
-            active = Desktop(backend="uia").get_active()
-            context["window_title"] = active.window_text()
-            context["window_handle"] = int(active.handle) if getattr(active, "handle", None) else None
-
-            element_info = getattr(active, "element_info", None)
-            if element_info:
-                context["window_class"] = getattr(element_info, "class_name", "") or ""
-                context["automation_id"] = getattr(element_info, "automation_id", "") or ""
+            desktop = Desktop(backend="uia")
         except Exception:
-            pass
+            return automation_ids
 
-        return context
+        for hwnd in self._seen_hwnds:
+            try:
+                element_info = desktop.window(handle=hwnd).element_info
+                automation_ids[hwnd] = getattr(element_info, "automation_id", "") or ""
+            except Exception:
+                continue
+
+        return automation_ids
+
+    def _write_event(self, event: Dict[str, Any]):
+        self._events_fp.write(_dumps(event) + b"\n")
+        self._event_count += 1
 
-    def _append_event(self, event: Dict[str, Any]):
-        with self._lock:
-            if not self.recording:
+    def _flush_pending_move(self):
+        if self._pending_move is not None:
+            self._write_event(self._pending_move.to_dict())
+            self._pending_move = None
+
+    def _stage_event(self, queue: deque, event):
+        queue.append(event)
+
+    def _pop_all(self, queue: deque) -> list:
+        events = []
+        try:
+            while True:
+                events.append(queue.popleft())
+        except IndexError:
+            return events
+
+    def _drain_queues(self) -> bool:
+        mouse_events = self._pop_all(self._mouse_queue)
+        key_events = self._pop_all(self._key_queue)
+        if not mouse_events and not key_events:
+            return False
+
+        for event in heapq.merge(mouse_events, key_events, key=_timestamp_of):
+            self._process_event(event)
+        return True
+
+    def _drain_loop(self):
+        while True:
+            recording = self.recording
+            if not self._drain_queues():
+                if not recording:
+                    return
+                time.sleep(0.001)
+
+    def _process_event(self, event):
+        now = event.timestamp
+
+        # Moves don't need window context for replay; keep only the latest
+        # position per sampling window.
+        if type(event) is MouseMove:
+            pending = self._pending_move
+            if pending is not None and now - self._last_move_ts < MOUSE_MOVE_INTERVAL:
+                pending.x = event.x
+                pending.y = event.y
+                pending.timestamp = now
                 return
-            event["timestamp"] = self._now()
-            event["ui_context"] = self._capture_ui_context()
-            self.events.append(event)
+            self._flush_pending_move()
+            self._last_move_ts = now
+            self._pending_move = event
+            return
+
+        self._flush_pending_move()
+        record = event.to_dict()
+        record["ui_context"] = self._capture_ui_context()
+        self._write_event(record)
 
     def start_recording(self, macro_name: str) -> Dict[str, Any]:
         if not self.available:
@@ -90,57 +335,43 @@ class MacroRecorder:
         if self.recording:
             return {"success": False, "message": "Macro recording already in progress"}
 
-        self.current_macro_name = (macro_name or "default_macro").strip().replace(" ", "_")
-        self.events = []
+        self.current_macro_name = self._safe_name(macro_name)
+        self._events_fp = open(self._macro_path(self.current_macro_name), "wb", buffering=1 << 16)
+        self._event_count = 0
+        self._pending_move = None
+        self._last_hwnd = None
+        self._last_ctx = {}
+        self._seen_hwnds = set()
+        self._last_move_ts = 0.0
+        self._mouse_queue.clear()
+        self._key_queue.clear()
         self.start_ts = time.time()
         self.recording = True
 
+        self._drain_thread = Thread(target=self._drain_loop, name="MacroDrainThread", daemon=True)
+        self._drain_thread.start()
+        self._stage = self._stage_event
+
+        mouse_queue = self._mouse_queue
+        key_queue = self._key_queue
+
         def on_click(x, y, button, pressed):
-            self._append_event(
-                {
-                    "type": "mouse_click",
-                    "x": int(x),
-                    "y": int(y),
-                    "button": str(button).replace("Button.", ""),
-                    "pressed": bool(pressed),
-                }
+            self._stage(
+                mouse_queue,
+                MouseClick(self._now(), int(x), int(y), str(button).replace("Button.", ""), bool(pressed))
             )
 
         def on_move(x, y):
-            self._append_event(
-                {
-                    "type": "mouse_move",
-                    "x": int(x),
-                    "y": int(y),
-                }
-            )
+            self._stage(mouse_queue, MouseMove(self._now(), int(x), int(y)))
 
         def on_scroll(x, y, dx, dy):
-            self._append_event(
-                {
-                    "type": "mouse_scroll",
-                    "x": int(x),
-                    "y": int(y),
-                    "dx": int(dx),
-                    "dy": int(dy),
-                }
-            )
+            self._stage(mouse_queue, MouseScroll(self._now(), int(x), int(y), int(dx), int(dy)))
 
         def on_press(key):
-            self._append_event(
-                {
-                    "type": "key_press",
-                    "key": self._serialize_key(key),
-                }
-            )
+            self._stage(key_queue, KeyEvent(self._now(), True, *self._serialize_key(key)))
 
         def on_release(key):
-            self._append_event(
-                {
-                    "type": "key_release",
-                    "key": self._serialize_key(key),
-                }
-            )
+            self._stage(key_queue, KeyEvent(self._now(), False, *self._serialize_key(key)))
 
         self.mouse_listener = self._mouse_module.Listener(on_click=on_click, on_move=on_move, on_scroll=on_scroll)
         self.keyboard_listener = self._keyboard_module.Listener(on_press=on_press, on_release=on_release)
@@ -148,17 +379,27 @@ class MacroRecorder:
         self.mouse_listener.start()
         self.keyboard_listener.start()
 
-        logger.info(f"Macro recording started: {self.current_macro_name}")
+        logger.info("Macro recording started: %s", self.current_macro_name)
         return {"success": True, "message": f"Started macro recording: {self.current_macro_name}"}
 
+    def _safe_name(self, macro_name: str) -> str:
+        return (macro_name or "default_macro").strip().replace(" ", "_")
+
     def _macro_path(self, macro_name: str) -> Path:
-        safe_name = (macro_name or "default_macro").strip().replace(" ", "_")
-        return self.output_dir / f"{safe_name}.json"
+        return self.output_dir / f"{self._safe_name(macro_name)}.jsonl"
+
+    def _meta_path(self, macro_name: str) -> Path:
+        return self.output_dir / f"{self._safe_name(macro_name)}.meta.json"
+
+    def _legacy_macro_path(self, macro_name: str) -> Path:
+        return self.output_dir / f"{self._safe_name(macro_name)}.json"
 
     def stop_recording(self) -> Dict[str, Any]:
         if not self.recording:
             return {"success": False, "message": "No active macro recording"}
 
+        # In-flight callbacks become no-ops while the listeners unwind
+        self._stage = _noop
         self.recording = False
 
         try:
@@ -172,77 +413,143 @@ class MacroRecorder:
         self.mouse_listener = None
         self.keyboard_listener = None
 
-        output = {
+        # The drain thread exits once the staged events are written
+        if self._drain_thread:
+            self._drain_thread.join()
+            self._drain_thread = None
+
+        self._flush_pending_move()
+        self._events_fp.close()
+        self._events_fp = None
+
+        event_count = self._event_count
+        metadata = {
             "macro_name": self.current_macro_name,
             "created_at": int(time.time()),
-            "event_count": len(self.events),
-            "events": self.events,
+            "event_count": event_count,
+            "automation_ids": {str(hwnd): value for hwnd, value in self._resolve_automation_ids().items()},
         }
 
         macro_path = self._macro_path(self.current_macro_name)
-        with open(macro_path, "w", encoding="utf-8") as file_obj:
-            json.dump(output, file_obj, indent=2)
+        with open(self._meta_path(self.current_macro_name), "w", encoding="utf-8") as file_obj:
+            json.dump(metadata, file_obj, indent=2)
 
-        logger.info(f"Macro recording saved: {macro_path}")
+        logger.info("Macro recording saved: %s", macro_path)
         return {
             "success": True,
-            "message": f"Saved macro '{self.current_macro_name}' with {len(self.events)} events",
+            "message": f"Saved macro '{self.current_macro_name}' with {event_count} events",
             "macro_path": str(macro_path),
-            "event_count": len(self.events),
+            "event_count": event_count,
         }
 
-    def _deserialize_key(self, key_data: Dict[str, Any]):
-        kind = key_data.get("kind")
-        value = key_data.get("value")
+    def _iter_events(self, macro_path: Path) -> Iterator[Dict[str, Any]]:
+        """Yield recorded events one at a time without loading the whole trace."""
+        with open(macro_path, "rb") as file_obj:
+            if macro_path.suffix == ".json":
+                # Traces saved before JSONL streaming hold a single JSON document
+                yield from _loads(file_obj.read()).get("events", [])
+                return
 
-        if kind == "char":
-            return value
+            for line in file_obj:
+                if line.strip():
+                    yield _loads(line)
+
+    def _replay_handlers(self) -> Dict[str, Callable[[Dict[str, Any]], None]]:
+        """Build per-replay event handlers; key/button names are resolved once each."""
+        mouse = self.mouse_controller
+        keyboard = self.keyboard_controller
+        special_keys = self._keyboard_module.Key
+        buttons = self._mouse_module.Button
+        key_cache: Dict[str, Any] = {}
+        button_cache: Dict[str, Any] = {}
+
+        def resolve_key(key_data: Dict[str, Any]):
+            value = key_data.get("value")
+            if key_data.get("kind") == "char":
+                return value
+            key = key_cache.get(value)
+            if key is None:
+                key = key_cache[value] = getattr(special_keys, value, value)
+            return key
+
+        def on_mouse_move(event):
+            mouse.position = (event.get("x", 0), event.get("y", 0))
+
+        def on_mouse_click(event):
+            name = event.get("button", "left")
+            button = button_cache.get(name)
+            if button is None:
+                button = button_cache[name] = getattr(buttons, name, buttons.left)
+            if event.get("pressed", True):
+                mouse.press(button)
+            else:
+                mouse.release(button)
+
+        def on_mouse_scroll(event):
+            mouse.scroll(event.get("dx", 0), event.get("dy", 0))
+
+        def on_key_press(event):
+            keyboard.press(resolve_key(event.get("key", {})))
+
+        def on_key_release(event):
+            keyboard.release(resolve_key(event.get("key", {})))
 
-        return getattr(self._keyboard_module.Key, value, value)
+        return {
+            "mouse_move": on_mouse_move,
+            "mouse_click": on_mouse_click,
+            "mouse_scroll": on_mouse_scroll,
+            "key_press": on_key_press,
+            "key_release": on_key_release,
+        }
 
     def replay(self, macro_name: str, speed: float = 1.0) -> Dict[str, Any]:
         if not self.available:
             return {"success": False, "message": "Macro recorder dependencies unavailable"}
 
         macro_path = self._macro_path(macro_name)
+        if not macro_path.exists():
+            macro_path = self._legacy_macro_path(macro_name)
         if not macro_path.exists():
             return {"success": False, "message": f"Macro '{macro_name}' not found"}
 
-        with open(macro_path, "r", encoding="utf-8") as file_obj:
-            payload = json.load(file_obj)
-
-        events = payload.get("events", [])
-        if not events:
-            return {"success": False, "message": f"Macro '{macro_name}' has no events"}
-
         speed = max(0.1, float(speed))
         previous_ts = 0.0
+        event_count = 0
+        handlers = self._replay_handlers()
+
+        # 1 ms timer resolution on Windows while replaying
+        winmm = self._load_winmm()
+        if winmm:
+            winmm.timeBeginPeriod(1)
+
+        try:
+            # Each event is scheduled against an absolute deadline so sleep
+            # jitter doesn't accumulate over long macros.
+            start = time.perf_counter()
+            for event in self._iter_events(macro_path):
+                event_count += 1
+                ts = float(event.get("timestamp", previous_ts))
+                previous_ts = ts
+
+                target = start + ts / speed
+                remaining = target - time.perf_counter()
+                if remaining > 2 * REPLAY_SPIN_SECONDS:
+                    time.sleep(remaining - REPLAY_SPIN_SECONDS)
+                while time.perf_counter() < target:
+                    pass
+
+                handler = handlers.get(event.get("type"))
+                if handler:
+                    handler(event)
+        finally:
+            if winmm:
+                winmm.timeEndPeriod(1)
+
+        if not event_count:
+            return {"success": False, "message": f"Macro '{macro_name}' has no events"}
 
-        for event in events:
-            ts = float(event.get("timestamp", previous_ts))
-            sleep_for = max(0.0, (ts - previous_ts) / speed)
-            if sleep_for > 0:
-                time.sleep(sleep_for)
-            previous_ts = ts
-
-            event_type = event.get("type")
-            if event_type == "mouse_move":
-                self.mouse_controller.position = (event.get("x", 0), event.get("y", 0))
-            elif event_type == "mouse_click":
-                button = getattr(self._mouse_module.Button, event.get("button", "left"), self._mouse_module.Button.left)
-                if event.get("pressed", True):
-                    self.mouse_controller.press(button)
-                else:
-                    self.mouse_controller.release(button)
-            elif event_type == "mouse_scroll":
-                self.mouse_controller.scroll(event.get("dx", 0), event.get("dy", 0))
-            elif event_type == "key_press":
-                self.keyboard_controller.press(self._deserialize_key(event.get("key", {})))
-            elif event_type == "key_release":
-                self.keyboard_controller.release(self._deserialize_key(event.get("key", {})))
-
-        logger.info(f"Macro replay completed: {macro_name}")
-        return {"success": True, "message": f"Replayed macro '{macro_name}'", "event_count": len(events)}
+        logger.info("Macro replay completed: %s", macro_name)
+        return {"success": True, "message": f"Replayed macro '{macro_name}'", "event_count": event_count}
 
 
 macro_recorder = MacroRecorder()
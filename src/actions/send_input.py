@@ -0,0 +1,227 @@
+"""
+SendInput bindings - Batched Win32 mouse/keyboard injection.
+"""
+import ctypes
+import logging
+import sys
+import time
+from ctypes import wintypes
+from typing import Tuple
+
+logger = logging.getLogger("SendInput")
+
+INPUT_MOUSE = 0
+INPUT_KEYBOARD = 1
+
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_ABSOLUTE = 0x8000
+MOUSEEVENTF_VIRTUALDESK = 0x4000
+
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+
+# Characters sent as real virtual keys; apps ignore them as Unicode packets
+_CONTROL_KEYS = {
+    "\n": 0x0D,  # VK_RETURN
+    "\t": 0x09,  # VK_TAB
+    "\b": 0x08,  # VK_BACK
+}
+
+# Characters per SendInput call when typing without an interval
+TEXT_CHUNK_SIZE = 512
+
+# (down, up) flags per mouse button
+_BUTTON_FLAGS = {
+    "left": (0x0002, 0x0004),
+    "right": (0x0008, 0x0010),
+    "middle": (0x0020, 0x0040),
+}
+
+ULONG_PTR = ctypes.c_size_t
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", wintypes.LONG),
+        ("dy", wintypes.LONG),
+        ("mouseData", wintypes.DWORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR),
+    ]
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", wintypes.WORD),
+        ("wScan", wintypes.WORD),
+        ("dwFlags", wintypes.DWORD),
+        ("time", wintypes.DWORD),
+        ("dwExtraInfo", ULONG_PTR),
+    ]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ("uMsg", wintypes.DWORD),
+        ("wParamL", wintypes.WORD),
+        ("wParamH", wintypes.WORD),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _anonymous_ = ("u",)
+    _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+
+def _load_user32():
+    """Load user32 with SendInput prototypes, or None off Windows."""
+    if sys.platform != "win32":
+        return None
+
+    try:
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        user32.SendInput.argtypes = [wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int]
+        user32.SendInput.restype = wintypes.UINT
+        user32.GetSystemMetrics.argtypes = [ctypes.c_int]
+        user32.GetSystemMetrics.restype = ctypes.c_int
+        return user32
+    except Exception as e:
+        logger.warning("SendInput unavailable: %s", e)
+        return None
+
+
+_user32 = _load_user32()
+available = _user32 is not None
+
+
+def _send_count(inputs) -> int:
+    """Deliver an INPUT array in a single SendInput call; return events sent."""
+    sent = _user32.SendInput(len(inputs), inputs, ctypes.sizeof(INPUT))
+    if sent != len(inputs):
+        logger.warning("SendInput delivered %s/%s events", sent, len(inputs))
+    return sent
+
+
+def _send(inputs) -> bool:
+    """Deliver an INPUT array in a single SendInput call."""
+    return _send_count(inputs) == len(inputs)
+
+
+def click(x: int, y: int, button: str = "left", clicks: int = 1) -> bool:
+    """
+    Move to (x, y) and click in one SendInput call.
+
+    Args:
+        x, y: Screen coordinates
+        button: 'left', 'right', or 'middle'
+        clicks: Number of clicks
+
+    Returns:
+        True if every event was delivered
+    """
+    if not available:
+        return False
+
+    down, up = _BUTTON_FLAGS.get(button, _BUTTON_FLAGS["left"])
+
+    # Absolute coordinates are normalized to 0..65535 across the virtual desktop
+    left = _user32.GetSystemMetrics(SM_XVIRTUALSCREEN)
+    top = _user32.GetSystemMetrics(SM_YVIRTUALSCREEN)
+    width = max(2, _user32.GetSystemMetrics(SM_CXVIRTUALSCREEN))
+    height = max(2, _user32.GetSystemMetrics(SM_CYVIRTUALSCREEN))
+    dx = round((x - left) * 65535 / (width - 1))
+    dy = round((y - top) * 65535 / (height - 1))
+
+    inputs = (INPUT * (1 + 2 * clicks))()
+    move = inputs[0]
+    move.type = INPUT_MOUSE
+    move.mi.dx = dx
+    move.mi.dy = dy
+    move.mi.dwFlags = MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK
+
+    for i in range(clicks):
+        for offset, flags in ((1, down), (2, up)):
+            event = inputs[2 * i + offset]
+            event.type = INPUT_MOUSE
+            event.mi.dwFlags = flags
+
+    return _send(inputs)
+
+
+def _text_inputs(text: str):
+    """Build key down/up INPUT pairs for every UTF-16 code unit in text."""
+    strokes = []
+    for char in text:
+        vk = _CONTROL_KEYS.get(char)
+        if vk:
+            strokes.append((vk, 0, 0))
+            continue
+        data = char.encode("utf-16-le")
+        for i in range(0, len(data), 2):
+            strokes.append((0, int.from_bytes(data[i:i + 2], "little"), KEYEVENTF_UNICODE))
+
+    inputs = (INPUT * (2 * len(strokes)))()
+    for i, (vk, scan, flags) in enumerate(strokes):
+        for offset, extra in ((0, 0), (1, KEYEVENTF_KEYUP)):
+            event = inputs[2 * i + offset]
+            event.type = INPUT_KEYBOARD
+            event.ki.wVk = vk
+            event.ki.wScan = scan
+            event.ki.dwFlags = flags | extra
+    return inputs
+
+
+def _chars_delivered(chunk: str, events: int) -> int:
+    """Count the leading characters of chunk fully typed by the first events."""
+    strokes = events // 2
+    for count, char in enumerate(chunk):
+        needed = 1 if char in _CONTROL_KEYS else len(char.encode("utf-16-le")) // 2
+        if needed > strokes:
+            return count
+        strokes -= needed
+    return len(chunk)
+
+
+def type_text(text: str, interval: float = 0.0) -> Tuple[bool, int]:
+    """
+    Type text as Unicode keyboard events.
+
+    Args:
+        text: Text to type
+        interval: Delay between characters; 0 sends the text in large batches
+
+    Returns:
+        (True if every event was delivered, number of characters typed).
+        Characters are counted in text with CRLF normalized to LF, so a
+        caller can resume from that offset after a short write.
+    """
+    if not available or not text:
+        return False, 0
+
+    text = text.replace("\r\n", "\n")
+    if interval > 0:
+        chunks = list(text)
+    else:
+        chunks = [text[i:i + TEXT_CHUNK_SIZE] for i in range(0, len(text), TEXT_CHUNK_SIZE)]
+
+    delivered = 0
+    for chunk in chunks:
+        inputs = _text_inputs(chunk)
+        sent = _send_count(inputs)
+        if sent != len(inputs):
+            return False, delivered + _chars_delivered(chunk, sent)
+        delivered += len(chunk)
+        if interval > 0:
+            time.sleep(interval)
+
+    return True, delivered
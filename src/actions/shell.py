@@ -1,13 +1,234 @@
 """
 Shell Executor - Executes system commands.
 """
+import base64
+import functools
 import logging
+import os
+import queue
+import re
+import shutil
 import subprocess
-from typing import Tuple, List, Optional
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, Tuple, List, Optional
 from src.core.config import config
 
 logger = logging.getLogger("Shell")
 
+CREATE_NO_WINDOW = 0x08000000 if os.name == "nt" else 0
+CREATE_NEW_CONSOLE = 0x00000010 if os.name == "nt" else 0
+
+# Windows PowerShell first, then PowerShell 7+ for machines that only have pwsh
+POWERSHELL_EXECUTABLES = ("powershell", "pwsh")
+
+# Skip profile loading and prompts; every PowerShell launch shares these
+POWERSHELL_FLAGS = ["-NoLogo", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass"]
+
+# `exit` would end the shared host instead of the command, so such commands
+# run in their own process where the exit code is reported normally
+_EXIT_RE = re.compile(r"\bexit\b", re.IGNORECASE)
+
+# Characters cmd treats as syntax outside double quotes
+_CMD_SPECIAL_RE = re.compile(r'[\^&|<>()]')
+
+# A frozen build's sys.executable is the app itself, not an interpreter
+PYTHON_EXECUTABLE = "python" if getattr(sys, "frozen", False) else sys.executable
+
+
+@functools.cache
+def _system_info() -> dict:
+    """Collect system info once; none of it changes while the process runs."""
+    try:
+        import platform
+        
+        # platform.processor() shells out to WMI on Windows; the environment
+        # already carries the same identifier.
+        processor = os.environ.get("PROCESSOR_IDENTIFIER") or platform.processor()
+        
+        return {
+            "os": platform.system(),
+            "version": platform.version(),
+            "machine": platform.machine(),
+            "processor": processor,
+            "python_version": platform.python_version()
+        }
+    except Exception:
+        return {}
+
+
+class PowerShellHost:
+    """
+    Long-lived PowerShell process fed commands over stdin.
+
+    Starting powershell.exe costs hundreds of milliseconds, so one child
+    is kept alive and each command is followed by a sentinel line on both
+    stdout and stderr that marks where its output ends. Each command runs
+    in its own child scope with the working directory restored afterwards,
+    so variables and `cd` do not carry over into the next command.
+    """
+
+    def __init__(self):
+        """Initialize host state; the process starts on first use."""
+        self._proc: Optional[subprocess.Popen] = None
+        self.executable: Optional[str] = None
+        self._lock = threading.Lock()
+        self._sentinel = f"__END_OF_CMD_{uuid.uuid4().hex}__"
+        self._stdout_lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._stderr_lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    @staticmethod
+    def _pump(pipe, lines: queue.Queue):
+        """Forward lines from a pipe into a queue; None marks EOF."""
+        try:
+            for line in pipe:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def _start(self):
+        """Spawn the PowerShell child and its pipe reader threads."""
+        if self.executable is None:
+            self.executable = next(
+                (name for name in POWERSHELL_EXECUTABLES if shutil.which(name)), None
+            )
+            if self.executable is None:
+                raise FileNotFoundError("No PowerShell executable found on PATH")
+
+        self._proc = subprocess.Popen(
+            [self.executable, *POWERSHELL_FLAGS, "-Command", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            creationflags=CREATE_NO_WINDOW
+        )
+
+        # Fresh queues so lines from a killed host never leak into new output
+        self._stdout_lines = queue.Queue()
+        self._stderr_lines = queue.Queue()
+        for pipe, lines in ((self._proc.stdout, self._stdout_lines),
+                            (self._proc.stderr, self._stderr_lines)):
+            threading.Thread(target=self._pump, args=(pipe, lines), daemon=True).start()
+
+        self._proc.stdin.write(
+            "[Console]::OutputEncoding = [Text.Encoding]::UTF8; "
+            "$ProgressPreference = 'SilentlyContinue'\n"
+        )
+        self._proc.stdin.flush()
+        logger.info("PowerShell host started: %s", self.executable)
+
+    @staticmethod
+    def can_run(command: str) -> bool:
+        """Return False for commands that would end the shared host itself."""
+        return not _EXIT_RE.search(command)
+
+    def _wrap(self, command: str) -> str:
+        """Build the single stdin line that runs command and emits sentinels."""
+        # Base64 keeps multi-line scripts and quotes intact on one input line
+        encoded = base64.b64encode(command.encode("utf-8")).decode("ascii")
+        sentinel = self._sentinel
+        # `&` on a script block gives the command a child scope; the location
+        # is session-wide, so it is pushed and popped around the command
+        return (
+            "$global:LASTEXITCODE = 0; $__errs = $Error.Count; $__ok = $true; "
+            "Push-Location; "
+            "try { & ([ScriptBlock]::Create([Text.Encoding]::UTF8.GetString("
+            f"[Convert]::FromBase64String('{encoded}')))) "
+            "| Out-String -Stream -Width 4096 | ForEach-Object { [Console]::Out.WriteLine($_) } } "
+            "catch { $__ok = $false; [Console]::Error.WriteLine($_.ToString()) } "
+            "finally { Pop-Location }; "
+            "if ($Error.Count -gt $__errs) { $__ok = $false }; "
+            "$__code = if ($global:LASTEXITCODE) { $global:LASTEXITCODE } "
+            "elseif ($__ok) { 0 } else { 1 }; "
+            f"[Console]::Out.WriteLine('{sentinel} ' + $__code); "
+            f"[Console]::Error.WriteLine('{sentinel}')\n"
+        )
+
+    def _read_until_sentinel(self, lines: queue.Queue, deadline: float) -> Tuple[str, str]:
+        """
+        Collect lines up to the sentinel.
+
+        Returns:
+            Tuple of (output, text following the sentinel on its line)
+        """
+        collected = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired("powershell", 0)
+            try:
+                line = lines.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired("powershell", 0)
+
+            if line is None:
+                raise RuntimeError("PowerShell host exited")
+
+            index = line.find(self._sentinel)
+            if index < 0:
+                collected.append(line)
+                continue
+
+            # Output without a trailing newline shares the sentinel's line
+            collected.append(line[:index])
+            return "".join(collected), line[index + len(self._sentinel):].strip()
+
+    def run(self, command: str, timeout: float) -> Tuple[int, str, str]:
+        """
+        Run a command in the persistent host.
+
+        Raises:
+            subprocess.TimeoutExpired: The command overran; the host is killed
+            FileNotFoundError: PowerShell is not installed
+            BrokenPipeError: The host died before the command was sent
+            RuntimeError: The host exited mid-command
+        """
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+
+            try:
+                self._proc.stdin.write(self._wrap(command))
+                self._proc.stdin.flush()
+
+                deadline = time.monotonic() + timeout
+                stdout, code = self._read_until_sentinel(self._stdout_lines, deadline)
+                stderr, _ = self._read_until_sentinel(self._stderr_lines, deadline)
+            except Exception:
+                # Output state is unknown after a failure; start clean next time
+                self._kill()
+                raise
+
+            try:
+                return_code = int(code)
+            except ValueError:
+                return_code = 1
+            return (return_code, stdout, stderr)
+
+    def _kill(self):
+        """Terminate the child process."""
+        if self._proc is None:
+            return
+        try:
+            self._proc.kill()
+            self._proc.wait(timeout=5)
+        except Exception:
+            pass
+        self._proc = None
+
+    def close(self):
+        """Shut down the host."""
+        with self._lock:
+            self._kill()
+
 
 class ShellExecutor:
     """Executes shell commands with safety checks."""
@@ -15,8 +236,22 @@ class ShellExecutor:
     def __init__(self):
         """Initialize shell executor."""
         self.blacklist = config.get("safety.blacklist_commands", [])
+        # One alternation pattern scans a command for every term in a single pass
+        blacklist_lower = [term.lower() for term in self.blacklist]
+        self._blacklist_re = (
+            re.compile("|".join(map(re.escape, blacklist_lower))) if blacklist_lower else None
+        )
+        # Agents repeat the same few commands; the blacklist is fixed after init
+        self._matches_blacklist = functools.lru_cache(maxsize=1024)(self._scan_blacklist)
+        self._ps_host = PowerShellHost()
+        self._which_cache: Dict[str, Optional[str]] = {}
+        self._ps_host_failed = False
         logger.info("Shell executor initialized")
     
+    def _scan_blacklist(self, command: str) -> bool:
+        """Return True if any blacklisted term occurs in command."""
+        return bool(self._blacklist_re and self._blacklist_re.search(command.lower()))
+
     def is_dangerous(self, command: str) -> bool:
         """
         Check if a command is dangerous.
@@ -27,12 +262,9 @@ class ShellExecutor:
         Returns:
             True if command is blacklisted
         """
-        command_lower = command.lower()
-        
-        for blacklisted in self.blacklist:
-            if blacklisted.lower() in command_lower:
-                logger.warning(f"Dangerous command detected: {command}")
-                return True
+        if self._matches_blacklist(command):
+            logger.warning("Dangerous command detected: %s", command)
+            return True
         
         return False
     
@@ -48,28 +280,49 @@ class ShellExecutor:
             Tuple of (return_code, stdout, stderr)
         """
         if self.is_dangerous(command):
-            logger.error(f"Blocked dangerous PowerShell command: {command}")
+            logger.error("Blocked dangerous PowerShell command: %s", command)
             return (-1, "", "Command blocked for safety")
         
+        logger.info("Executing PowerShell: %s", command)
+
+        if not self._ps_host_failed and self._ps_host.can_run(command):
+            try:
+                return_code, stdout, stderr = self._ps_host.run(command, timeout)
+                logger.info("PowerShell completed with code: %s", return_code)
+                return (return_code, stdout, stderr)
+            except subprocess.TimeoutExpired:
+                logger.error("PowerShell command timed out: %s", command)
+                return (-1, "", "Command timed out")
+            except FileNotFoundError as e:
+                # No usable powershell binary; stop retrying the host
+                logger.warning("PowerShell host unavailable, using one-shot processes: %s", e)
+                self._ps_host_failed = True
+            except BrokenPipeError:
+                # Host died between commands, before this one was delivered
+                logger.warning("PowerShell host pipe closed, running command in a new process")
+            except Exception as e:
+                # The command may have run partway, so it is not retried
+                logger.error("Error executing PowerShell: %s", e)
+                return (-1, "", str(e))
+
         try:
-            logger.info(f"Executing PowerShell: {command}")
-            
             result = subprocess.run(
-                ["powershell", "-Command", command],
+                [self._ps_host.executable or "powershell", *POWERSHELL_FLAGS, "-Command", command],
                 capture_output=True,
                 text=True,
-                timeout=timeout
+                timeout=timeout,
+                creationflags=CREATE_NO_WINDOW
             )
             
-            logger.info(f"PowerShell completed with code: {result.returncode}")
+            logger.info("PowerShell completed with code: %s", result.returncode)
             
             return (result.returncode, result.stdout, result.stderr)
             
         except subprocess.TimeoutExpired:
-            logger.error(f"PowerShell command timed out: {command}")
+            logger.error("PowerShell command timed out: %s", command)
             return (-1, "", "Command timed out")
         except Exception as e:
-            logger.error(f"Error executing PowerShell: {e}")
+            logger.error("Error executing PowerShell: %s", e)
             return (-1, "", str(e))
     
     def execute_cmd(self, command: str, timeout: int = 30) -> Tuple[int, str, str]:
@@ -84,31 +337,173 @@ class ShellExecutor:
             Tuple of (return_code, stdout, stderr)
         """
         if self.is_dangerous(command):
-            logger.error(f"Blocked dangerous CMD command: {command}")
+            logger.error("Blocked dangerous CMD command: %s", command)
             return (-1, "", "Command blocked for safety")
         
         try:
-            logger.info(f"Executing CMD: {command}")
+            logger.info("Executing CMD: %s", command)
             
             result = subprocess.run(
                 command,
                 shell=True,
                 capture_output=True,
                 text=True,
-                timeout=timeout
+                timeout=timeout,
+                creationflags=CREATE_NO_WINDOW
             )
             
-            logger.info(f"CMD completed with code: {result.returncode}")
+            logger.info("CMD completed with code: %s", result.returncode)
             
             return (result.returncode, result.stdout, result.stderr)
             
         except subprocess.TimeoutExpired:
-            logger.error(f"CMD command timed out: {command}")
+            logger.error("CMD command timed out: %s", command)
             return (-1, "", "Command timed out")
         except Exception as e:
-            logger.error(f"Error executing CMD: {e}")
+            logger.error("Error executing CMD: %s", e)
             return (-1, "", str(e))
     
+    def execute_batch(self, commands: List[str], shell: str = "powershell",
+                      timeout: int = 30) -> List[Tuple[int, str, str]]:
+        """
+        Execute several commands, stopping at the first failure (like &&).
+        
+        CMD batches run as one batch-file process; PowerShell batches reuse
+        the persistent host, where per-command dispatch is already cheap.
+        
+        Args:
+            commands: Commands to run in order
+            shell: 'powershell' or 'cmd'
+            timeout: Timeout in seconds for the whole batch
+            
+        Returns:
+            List of (return_code, stdout, stderr) for each command that ran
+        """
+        for command in commands:
+            if self.is_dangerous(command):
+                logger.error("Blocked batch with dangerous command: %s", command)
+                return [(-1, "", "Command blocked for safety")]
+        
+        if shell == "cmd":
+            return self._execute_cmd_batch(commands, timeout)
+        if shell != "powershell":
+            return [(-1, "", f"Unsupported shell: {shell}")]
+        
+        results = []
+        deadline = time.monotonic() + timeout
+        for command in commands:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                results.append((-1, "", "Command timed out"))
+                break
+            result = self.execute_powershell(command, timeout=remaining)
+            results.append(result)
+            if result[0] != 0:
+                break
+        return results
+    
+    @staticmethod
+    def _split_steps(text: str, marker: str) -> List[str]:
+        """Split output on step markers, dropping the newline each echo adds."""
+        parts = text.split(marker)
+        for i in range(1, len(parts)):
+            part = parts[i]
+            if part.startswith("\r\n"):
+                parts[i] = part[2:]
+            elif part.startswith("\n"):
+                parts[i] = part[1:]
+        return parts
+    
+    @staticmethod
+    def _escape_for_batch_line(command: str) -> str:
+        """
+        Escape a command-line command so a .bat line passes it through verbatim.
+        
+        The batch parser strips one level of escaping: carets protect cmd
+        syntax outside quotes and doubled percents survive as single ones,
+        so `cmd /c` on that line parses the command exactly as typed,
+        parentheses, `&` and `for %i` loops included.
+        """
+        escaped = []
+        for index, segment in enumerate(command.replace("%", "%%").split('"')):
+            if index % 2 == 0:
+                segment = _CMD_SPECIAL_RE.sub(r"^\g<0>", segment)
+            escaped.append(segment)
+        return '"'.join(escaped)
+    
+    def _cmd_batch_script(self, commands: List[str], marker: str) -> str:
+        """Build a .bat that runs each command in its own cmd and stops on failure."""
+        lines = ["@echo off", "chcp 65001 >nul"]
+        for command in commands:
+            lines += [
+                # /s with escaped outer quotes: cmd strips exactly those two,
+                # so commands starting with a quoted path stay intact
+                f'cmd /d /s /c ^"{self._escape_for_batch_line(command)}^"',
+                "if %errorlevel% neq 0 exit /b %errorlevel%",
+                f"echo {marker}",
+                f"1>&2 echo {marker}",
+            ]
+        return "\r\n".join(lines) + "\r\n"
+    
+    def _execute_cmd_batch(self, commands: List[str], timeout: int) -> List[Tuple[int, str, str]]:
+        """Run CMD commands in one shell, echoing a marker to both streams after each."""
+        marker = f"::STEP::{uuid.uuid4().hex}::"
+        script_path = None
+        
+        try:
+            logger.info("Executing CMD batch of %s commands", len(commands))
+            
+            if os.name == "nt":
+                with tempfile.NamedTemporaryFile(
+                    "w", suffix=".bat", delete=False, encoding="utf-8", newline=""
+                ) as script_file:
+                    script_file.write(self._cmd_batch_script(commands, marker))
+                script_path = script_file.name
+                args, use_shell = ["cmd", "/d", "/c", script_path], False
+            else:
+                # Braces group without a subshell; the newline ends the command
+                step_end = f"{{ echo {marker}; echo {marker} 1>&2; }}"
+                args = " && ".join(f"{{ {command}\n}} && {step_end}" for command in commands)
+                use_shell = True
+            
+            result = subprocess.run(
+                args,
+                shell=use_shell,
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                timeout=timeout,
+                creationflags=CREATE_NO_WINDOW
+            )
+        except subprocess.TimeoutExpired:
+            logger.error("CMD batch timed out")
+            return [(-1, "", "Command timed out")]
+        except Exception as e:
+            logger.error("Error executing CMD batch: %s", e)
+            return [(-1, "", str(e))]
+        finally:
+            if script_path:
+                try:
+                    os.unlink(script_path)
+                except OSError:
+                    pass
+        
+        stdout_parts = self._split_steps(result.stdout, marker)
+        stderr_parts = self._split_steps(result.stderr, marker)
+        completed = len(stdout_parts) - 1
+        
+        results = [
+            (0, stdout_parts[i], stderr_parts[i] if i < len(stderr_parts) else "")
+            for i in range(completed)
+        ]
+        if completed < len(commands):
+            # The first command without a marker is the one that failed
+            results.append((result.returncode or 1, stdout_parts[-1], stderr_parts[-1]))
+        
+        logger.info("CMD batch completed %s/%s commands", completed, len(commands))
+        return results
+    
     def open_application(self, app_name: str) -> bool:
         """
         Open an application.
@@ -120,20 +515,34 @@ class ShellExecutor:
             True if successful
         """
         try:
-            logger.info(f"Opening application: {app_name}")
+            logger.info("Opening application: %s", app_name)
             
-            # Try to start the application
-            result = subprocess.Popen(
-                app_name,
-                shell=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
+            if app_name not in self._which_cache:
+                self._which_cache[app_name] = shutil.which(app_name)
+            app_path = self._which_cache[app_name]
+            
+            if app_path:
+                # Launch the executable directly instead of through cmd.exe.
+                # Like `start`, console programs (cmd, python) get their own
+                # visible console and stdio; GUI programs ignore the flag
+                subprocess.Popen(
+                    [app_path],
+                    close_fds=True,
+                    creationflags=CREATE_NEW_CONSOLE
+                )
+            else:
+                # Arguments, URLs and shell built-ins still need the shell
+                subprocess.Popen(
+                    app_name,
+                    shell=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
             
             return True
             
         except Exception as e:
-            logger.error(f"Error opening application: {e}")
+            logger.error("Error opening application: %s", e)
             return False
     
     def execute_python(self, code: str, timeout: int = 30) -> Tuple[int, str, str]:
@@ -155,10 +564,11 @@ class ShellExecutor:
             logger.info("Executing Python code")
             
             result = subprocess.run(
-                ["python", "-c", code],
+                [PYTHON_EXECUTABLE, "-I", "-c", code],
                 capture_output=True,
                 text=True,
-                timeout=timeout
+                timeout=timeout,
+                creationflags=CREATE_NO_WINDOW
             )
             
             return (result.returncode, result.stdout, result.stderr)
@@ -167,7 +577,7 @@ class ShellExecutor:
             logger.error("Python code timed out")
             return (-1, "", "Code timed out")
         except Exception as e:
-            logger.error(f"Error executing Python: {e}")
+            logger.error("Error executing Python: %s", e)
             return (-1, "", str(e))
     
     def get_system_info(self) -> dict:
@@ -177,18 +587,7 @@ class ShellExecutor:
         Returns:
             Dictionary with system info
         """
-        try:
-            import platform
-            
-            return {
-                "os": platform.system(),
-                "version": platform.version(),
-                "machine": platform.machine(),
-                "processor": platform.processor(),
-                "python_version": platform.python_version()
-            }
-        except:
-            return {}
+        return dict(_system_info())
 
 
 # Global shell executor instance
@@ -2,12 +2,68 @@
 Global Hotkey Handler
 Listens for keyboard combinations to trigger the agent.
 """
+import ctypes
 import logging
-from threading import Thread
-from typing import Callable
+import sys
+from ctypes import wintypes
+from threading import Event, Thread
+from typing import Callable, Optional, Tuple
 
 logger = logging.getLogger("Hotkey")
 
+WM_HOTKEY = 0x0312
+WM_QUIT = 0x0012
+MOD_NOREPEAT = 0x4000
+HOTKEY_ID = 1
+
+_MODIFIERS = {
+    "alt": 0x0001,
+    "ctrl": 0x0002,
+    "shift": 0x0004,
+    "cmd": 0x0008,
+    "win": 0x0008,
+}
+
+_VIRTUAL_KEYS = {
+    "space": 0x20,
+    "enter": 0x0D,
+    "tab": 0x09,
+    "esc": 0x1B,
+    "backspace": 0x08,
+    "insert": 0x2D,
+    "delete": 0x2E,
+    "home": 0x24,
+    "end": 0x23,
+    "page_up": 0x21,
+    "page_down": 0x22,
+    "pause": 0x13,
+    **{f"f{n}": 0x6F + n for n in range(1, 25)},
+}
+
+
+def parse_win32_hotkey(hotkey: str) -> Optional[Tuple[int, int]]:
+    """
+    Convert a pynput-style hotkey ("<ctrl>+<space>") to RegisterHotKey args.
+    
+    Returns:
+        (modifiers, virtual_key), or None if the combination can't be mapped
+    """
+    modifiers = MOD_NOREPEAT
+    vk = None
+    for token in hotkey.lower().split("+"):
+        token = token.strip().strip("<>")
+        if token in _MODIFIERS:
+            modifiers |= _MODIFIERS[token]
+        elif vk is not None:
+            return None
+        elif token in _VIRTUAL_KEYS:
+            vk = _VIRTUAL_KEYS[token]
+        elif len(token) == 1 and token.isalnum() and token.isascii():
+            vk = ord(token.upper())
+        else:
+            return None
+    return (modifiers, vk) if vk is not None else None
+
 
 class HotkeyHandler:
     """Handles global hotkey detection."""
@@ -24,6 +80,8 @@ class HotkeyHandler:
         self.callback = callback
         self.listener = None
         self.running = False
+        self._native_thread = None
+        self._native_thread_id = None
         
         self._parse_hotkey()
     
@@ -32,7 +90,7 @@ class HotkeyHandler:
         # Convert common formats
         self.hotkey_parsed = self.hotkey.replace("<", "").replace(">", "")
         
-        logger.info(f"Hotkey configured: {self.hotkey}")
+        logger.info("Hotkey configured: %s", self.hotkey)
     
     def start(self):
         """Start listening for hotkey."""
@@ -40,6 +98,9 @@ class HotkeyHandler:
             logger.warning("Hotkey listener already running")
             return
         
+        if sys.platform == "win32" and self._start_native():
+            return
+        
         try:
             from pynput import keyboard
             
@@ -63,15 +124,78 @@ class HotkeyHandler:
         except ImportError:
             logger.error("pynput not installed. Install with: pip install pynput")
         except Exception as e:
-            logger.error(f"Error starting hotkey listener: {e}")
+            logger.error("Error starting hotkey listener: %s", e)
+    
+    def _start_native(self) -> bool:
+        """
+        Register the hotkey with RegisterHotKey so only the chord reaches us.
+        
+        Returns:
+            True if the native listener is running
+        """
+        parsed = parse_win32_hotkey(self.hotkey)
+        if parsed is None:
+            logger.info("Hotkey %s not mappable to RegisterHotKey, using pynput", self.hotkey)
+            return False
+        
+        modifiers, vk = parsed
+        registered = Event()
+        result = {"ok": False}
+        
+        def message_loop():
+            user32 = ctypes.WinDLL("user32", use_last_error=True)
+            kernel32 = ctypes.WinDLL("kernel32")
+            
+            # WM_HOTKEY is posted to the registering thread's queue
+            self._native_thread_id = kernel32.GetCurrentThreadId()
+            result["ok"] = bool(user32.RegisterHotKey(None, HOTKEY_ID, modifiers, vk))
+            registered.set()
+            if not result["ok"]:
+                return
+            
+            msg = wintypes.MSG()
+            try:
+                while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                    if msg.message == WM_HOTKEY and msg.wParam == HOTKEY_ID:
+                        logger.info("Hotkey activated")
+                        if self.callback:
+                            try:
+                                self.callback()
+                            except Exception as e:
+                                logger.error("Hotkey callback failed: %s", e)
+            finally:
+                user32.UnregisterHotKey(None, HOTKEY_ID)
+        
+        self._native_thread = Thread(target=message_loop, name="HotkeyThread", daemon=True)
+        self._native_thread.start()
+        registered.wait(timeout=2)
+        
+        if not result["ok"]:
+            logger.warning("RegisterHotKey failed for %s, using pynput", self.hotkey)
+            self._native_thread = None
+            return False
+        
+        self.running = True
+        logger.info("Hotkey listener started (RegisterHotKey)")
+        return True
     
     def stop(self):
         """Stop listening for hotkey."""
+        if self._native_thread:
+            ctypes.WinDLL("user32").PostThreadMessageW(self._native_thread_id, WM_QUIT, 0, 0)
+            self._native_thread.join(timeout=2)
+            self._native_thread = None
+            self.running = False
+            logger.info("Hotkey listener stopped")
+        
         if self.listener:
             self.listener.stop()
             self.running = False
             logger.info("Hotkey listener stopped")
     
-    def __del__(self):
-        """Destructor."""
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
         self.stop()
@@ -3,10 +3,22 @@ Audio Recorder - Captures microphone input.
 """
 import logging
 import threading
+import weakref
 import numpy as np
 
 logger = logging.getLogger("AudioRecorder")
 
+# Initial capture buffer length; it doubles if a recording runs longer
+INITIAL_BUFFER_SECONDS = 30
+
+
+def _terminate_audio(audio):
+    """Release PortAudio; runs from cleanup() or the GC/exit finalizer."""
+    try:
+        audio.terminate()
+    except Exception:
+        pass
+
 
 class AudioRecorder:
     """Records audio from microphone."""
@@ -25,23 +37,31 @@ class AudioRecorder:
         self.chunk_size = chunk_size
         
         self.is_recording = False
-        self.frames = []
+        # Samples are copied straight into one preallocated int16 buffer
+        self._buffer = np.empty(0, dtype=np.int16)
+        self._write_pos = 0
         self.stream = None
         self.audio = None
+        self._pa_continue = None
         
         self._initialize_audio()
+        
+        # Finalizer instead of __del__: holds no reference to self and
+        # runs at most once, from cleanup(), garbage collection or exit
+        self._finalizer = weakref.finalize(self, _terminate_audio, self.audio) if self.audio else None
     
     def _initialize_audio(self):
         """Initialize PyAudio."""
         try:
             import pyaudio
             self.audio = pyaudio.PyAudio()
+            self._pa_continue = pyaudio.paContinue
             logger.info("Audio system initialized")
         except ImportError:
             logger.error("PyAudio not installed. Install with: pip install pyaudio")
             self.audio = None
         except Exception as e:
-            logger.error(f"Error initializing audio: {e}")
+            logger.error("Error initializing audio: %s", e)
             self.audio = None
     
     def start_recording(self):
@@ -57,7 +77,8 @@ class AudioRecorder:
         try:
             import pyaudio
             
-            self.frames = []
+            self._buffer = np.empty(INITIAL_BUFFER_SECONDS * self.sample_rate * self.channels, dtype=np.int16)
+            self._write_pos = 0
             self.is_recording = True
             
             # Open stream
@@ -75,18 +96,37 @@ class AudioRecorder:
             return True
             
         except Exception as e:
-            logger.error(f"Error starting recording: {e}")
+            logger.error("Error starting recording: %s", e)
             self.is_recording = False
             return False
     
     def _audio_callback(self, in_data, frame_count, time_info, status):
         """Callback for audio stream."""
-        import pyaudio
-        
         if self.is_recording:
-            self.frames.append(in_data)
+            samples = np.frombuffer(in_data, dtype=np.int16)
+            end = self._write_pos + len(samples)
+            if end > len(self._buffer):
+                grown = np.empty(max(end, 2 * len(self._buffer)), dtype=np.int16)
+                grown[:self._write_pos] = self._buffer[:self._write_pos]
+                self._buffer = grown
+            self._buffer[self._write_pos:end] = samples
+            self._write_pos = end
         
-        return (in_data, pyaudio.paContinue)
+        # Input-only stream: no output buffer to hand back
+        return (None, self._pa_continue)
+    
+    def snapshot(self, start: int = 0) -> np.ndarray:
+        """
+        Return samples captured so far, from start, without stopping.
+        
+        The view is safe while recording continues: samples below the
+        write position never change, and a grown buffer copies them first.
+        """
+        # Read the position before the buffer; the callback swaps in a grown
+        # buffer before advancing the position
+        end = self._write_pos
+        buffer = self._buffer
+        return buffer[start:end]
     
     def stop_recording(self) -> np.ndarray:
         """
@@ -107,18 +147,17 @@ class AudioRecorder:
                 self.stream.close()
                 self.stream = None
             
-            # Convert frames to numpy array
-            if self.frames:
-                audio_data = b''.join(self.frames)
-                audio_array = np.frombuffer(audio_data, dtype=np.int16)
-                logger.info(f"Recording stopped. Captured {len(audio_array)} samples")
+            # A fresh buffer is allocated per recording, so a view is safe to return
+            if self._write_pos:
+                audio_array = self._buffer[:self._write_pos]
+                logger.info("Recording stopped. Captured %s samples", len(audio_array))
                 return audio_array
             else:
                 logger.warning("No audio data captured")
                 return np.array([])
                 
         except Exception as e:
-            logger.error(f"Error stopping recording: {e}")
+            logger.error("Error stopping recording: %s", e)
             return np.array([])
     
     def record_duration(self, duration_seconds: float) -> np.ndarray:
@@ -148,14 +187,13 @@ class AudioRecorder:
             except:
                 pass
         
-        if self.audio:
-            try:
-                self.audio.terminate()
-            except:
-                pass
+        if self._finalizer:
+            self._finalizer()
         
         logger.info("Audio recorder cleaned up")
     
-    def __del__(self):
-        """Destructor."""
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
         self.cleanup()
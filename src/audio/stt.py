@@ -3,26 +3,35 @@ Speech-to-Text (STT) Module - The "Ears"
 Uses faster-whisper for optimized local transcription.
 """
 import logging
-import wave
-import tempfile
-from pathlib import Path
+import os
+from typing import List, Tuple
 
 logger = logging.getLogger("STT")
 
+# faster-whisper consumes float32 mono audio at this rate
+WHISPER_SAMPLE_RATE = 16000
+
+# Clips quieter than this RMS (200 on the int16 scale) are treated as silence
+SILENCE_RMS_THRESHOLD = 200 / 32768
+
 
 class SpeechToText:
     """Speech-to-Text engine using faster-whisper."""
     
-    def __init__(self, model_size="base", device="auto"):
+    def __init__(self, model_size="base", device="auto", cpu_threads=0, beam_size=1):
         """
         Initialize STT engine.
         
         Args:
             model_size: Model size (tiny, base, small, medium, large)
             device: Device to use (auto, cpu, cuda)
+            cpu_threads: CTranslate2 threads; 0 uses WHISPER_THREADS or half the cores
+            beam_size: Decoding beam width; 1 is greedy, fastest for short commands
         """
         self.model_size = model_size
         self.device = device
+        self.beam_size = max(1, int(beam_size))
+        self.cpu_threads = int(cpu_threads or os.getenv("WHISPER_THREADS", 0)) or max(1, (os.cpu_count() or 4) // 2)
         self.model = None
         
         self._load_model()
@@ -32,33 +41,64 @@ class SpeechToText:
         try:
             from faster_whisper import WhisperModel
             
-            logger.info(f"Loading Whisper model: {self.model_size}")
+            logger.info("Loading Whisper model: %s", self.model_size)
             
-            # Determine device
+            # Determine device; CTranslate2 reports CUDA without importing torch
             device = self.device
             if device == "auto":
                 try:
-                    import torch
-                    device = "cuda" if torch.cuda.is_available() else "cpu"
-                except:
+                    import ctranslate2
+                    device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+                except Exception:
                     device = "cpu"
             
-            # Load model with optimizations
-            self.model = WhisperModel(
-                self.model_size,
+            # Load model with optimizations; half the cores by default leaves
+            # room for audio capture and wake word detection
+            model_kwargs = dict(
                 device=device,
-                compute_type="int8" if device == "cpu" else "float16"
+                compute_type="int8" if device == "cpu" else "int8_float16",
+                cpu_threads=self.cpu_threads,
+                num_workers=1
             )
             
-            logger.info(f"Whisper model loaded on {device}")
+            self.model = None
+            if device == "cuda":
+                # Fused flash attention needs a recent CTranslate2 and GPU;
+                # older stacks reject the flag and load the standard kernels
+                try:
+                    self.model = WhisperModel(self.model_size, flash_attention=True, **model_kwargs)
+                    logger.info("Whisper using flash attention")
+                except Exception as e:
+                    logger.info("Flash attention unavailable: %s", e)
+            
+            if self.model is None:
+                self.model = WhisperModel(self.model_size, **model_kwargs)
+            
+            logger.info("Whisper model loaded on %s (%s CPU threads)", device, self.cpu_threads)
+            self._warm_up()
             
         except ImportError:
             logger.error("faster-whisper not installed. Install with: pip install faster-whisper")
             self.model = None
         except Exception as e:
-            logger.error(f"Error loading Whisper model: {e}")
+            logger.error("Error loading Whisper model: %s", e)
             self.model = None
     
+    def _warm_up(self):
+        """Run one second of silence through the model so the first utterance skips setup cost."""
+        try:
+            import numpy as np
+            
+            segments, _ = self.model.transcribe(
+                np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32),
+                beam_size=1,
+                vad_filter=False
+            )
+            # Segments are generated lazily; consuming them runs the decoder
+            list(segments)
+        except Exception as e:
+            logger.debug("Whisper warm-up skipped: %s", e)
+    
     def transcribe(self, audio_path: str) -> str:
         """
         Transcribe audio file to text.
@@ -74,26 +114,66 @@ class SpeechToText:
             return ""
         
         try:
-            logger.info(f"Transcribing audio: {audio_path}")
-            
-            # Transcribe
-            segments, info = self.model.transcribe(
-                audio_path,
-                beam_size=5,
-                vad_filter=True,  # Voice activity detection
-                vad_parameters=dict(min_silence_duration_ms=500)
-            )
-            
-            # Combine segments
-            text = " ".join([seg.text for seg in segments]).strip()
-            
-            logger.info(f"Transcription: {text}")
-            return text
+            logger.info("Transcribing audio: %s", audio_path)
+            return self._run_model(audio_path)
             
         except Exception as e:
-            logger.error(f"Transcription error: {e}")
+            logger.error("Transcription error: %s", e)
             return ""
     
+    def _run_model(self, audio) -> str:
+        """Run Whisper on a file path or float32 sample array."""
+        segments = self._decode(audio)
+        
+        # Combine segments
+        text = " ".join([seg.text for seg in segments]).strip()
+        
+        logger.info("Transcription: %s", text)
+        return text
+    
+    def _decode(self, audio) -> list:
+        """Run Whisper and materialize its lazily generated segments."""
+        segments, info = self.model.transcribe(
+            audio,
+            beam_size=self.beam_size,
+            vad_filter=True,  # Voice activity detection
+            vad_parameters=dict(min_silence_duration_ms=500)
+        )
+        return list(segments)
+    
+    def _prepare_audio(self, audio_data, sample_rate: int):
+        """
+        Convert samples to 16 kHz float32 for the model.
+        
+        Returns:
+            Float32 array, or None for empty or silent audio
+        """
+        import numpy as np
+        
+        # Hand samples to the model directly instead of round-tripping a WAV
+        if audio_data.dtype == np.int16:
+            audio = audio_data.astype(np.float32) / 32768.0
+        else:
+            audio = audio_data.astype(np.float32, copy=False)
+        
+        # Cheap energy gate: skip the Whisper encoder on silent clips
+        if not len(audio):
+            return None
+        rms = float(np.sqrt(np.dot(audio, audio) / len(audio)))
+        if rms < SILENCE_RMS_THRESHOLD:
+            logger.info("Skipping transcription of silent clip (RMS %.4f)", rms)
+            return None
+        
+        if sample_rate != WHISPER_SAMPLE_RATE:
+            target_len = int(round(len(audio) * WHISPER_SAMPLE_RATE / sample_rate))
+            audio = np.interp(
+                np.linspace(0, len(audio) - 1, target_len),
+                np.arange(len(audio)),
+                audio
+            ).astype(np.float32)
+        
+        return audio
+    
     def transcribe_numpy(self, audio_data, sample_rate=16000) -> str:
         """
         Transcribe numpy array audio data.
@@ -109,30 +189,35 @@ class SpeechToText:
             return ""
         
         try:
-            # Save to temporary WAV file
-            temp_file = Path(tempfile.gettempdir()) / "temp_recording.wav"
-            
-            import numpy as np
-            
-            # Normalize
-            if audio_data.dtype != np.int16:
-                audio_data = (audio_data * 32767).astype(np.int16)
-            
-            # Save as WAV
-            with wave.open(str(temp_file), 'wb') as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(sample_rate)
-                wf.writeframes(audio_data.tobytes())
+            audio = self._prepare_audio(audio_data, sample_rate)
+            if audio is None:
+                return ""
+            return self._run_model(audio)
             
-            # Transcribe
-            result = self.transcribe(str(temp_file))
-            
-            # Cleanup
-            temp_file.unlink(missing_ok=True)
+        except Exception as e:
+            logger.error("Error transcribing numpy data: %s", e)
+            return ""
+    
+    def transcribe_segments(self, audio_data, sample_rate=16000) -> List[Tuple[float, float, str]]:
+        """
+        Transcribe numpy audio and keep segment timing, for incremental decoding.
+        
+        Args:
+            audio_data: Numpy array of audio samples
+            sample_rate: Sample rate (default: 16000)
             
-            return result
+        Returns:
+            List of (start_seconds, end_seconds, text) per segment
+        """
+        if not self.model:
+            return []
+        
+        try:
+            audio = self._prepare_audio(audio_data, sample_rate)
+            if audio is None:
+                return []
+            return [(seg.start, seg.end, seg.text.strip()) for seg in self._decode(audio)]
             
         except Exception as e:
-            logger.error(f"Error transcribing numpy data: {e}")
-            return ""
+            logger.error("Error transcribing numpy data: %s", e)
+            return []
@@ -3,13 +3,21 @@ Text-to-Speech (TTS) Module - The "Mouth"
 Uses Microsoft Edge TTS for high-quality local synthesis.
 """
 import asyncio
+import functools
+import hashlib
 import os
+import shutil
 import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
 import logging
 
 logger = logging.getLogger("TTS")
 
+# Synthesized clips kept on disk for reuse; least recently used are evicted
+TTS_CACHE_MAX_FILES = 256
+
 
 class TextToSpeech:
     """Text-to-Speech engine using Edge TTS."""
@@ -19,14 +27,48 @@ class TextToSpeech:
         self.voice = voice
         self.temp_dir = Path(tempfile.gettempdir()) / "openNova_tts"
         self.temp_dir.mkdir(exist_ok=True)
+        self._lru = self._load_cache_index()
         
         try:
             import edge_tts
             self.edge_tts = edge_tts
-            logger.info(f"TTS initialized with voice: {voice}")
+            logger.info("TTS initialized with voice: %s", voice)
         except ImportError:
             logger.error("edge-tts not installed. Install with: pip install edge-tts")
             self.edge_tts = None
+        
+        # With ffplay available, fresh speech is played while it downloads
+        self._ffplay = shutil.which("ffplay")
+        
+        # One long-lived event loop serves every synthesis request
+        self._loop = None
+        if self.edge_tts:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, name="TTSLoop", daemon=True).start()
+    
+    def _load_cache_index(self) -> "OrderedDict[Path, None]":
+        """Index cached clips from disk, oldest first."""
+        try:
+            files = sorted(self.temp_dir.glob("speech_*.mp3"), key=lambda path: path.stat().st_mtime)
+        except OSError:
+            files = []
+        return OrderedDict((path, None) for path in files)
+    
+    def _cache_path(self, text: str) -> Path:
+        """Return the cache file for text in the current voice."""
+        key = hashlib.blake2b(f"{self.voice}\0{text}".encode("utf-8"), digest_size=10).hexdigest()
+        return self.temp_dir / f"speech_{key}.mp3"
+    
+    def _touch_cache(self, path: Path):
+        """Mark a clip as most recently used and evict beyond the cap."""
+        self._lru[path] = None
+        self._lru.move_to_end(path)
+        while len(self._lru) > TTS_CACHE_MAX_FILES:
+            oldest, _ = self._lru.popitem(last=False)
+            try:
+                oldest.unlink()
+            except OSError:
+                pass
     
     async def _synthesize_async(self, text: str) -> Path:
         """Synthesize speech asynchronously."""
@@ -34,30 +76,94 @@ class TextToSpeech:
             logger.error("Edge TTS not available")
             return None
         
-        # Generate unique filename
-        import hashlib
-        text_hash = hashlib.md5(text.encode()).hexdigest()[:8]
-        output_file = self.temp_dir / f"speech_{text_hash}.mp3"
+        output_file = self._cache_path(text)
+        try:
+            if output_file.stat().st_size > 0:
+                # Keep mtime in step with recency so eviction order survives restarts
+                os.utime(output_file)
+                self._touch_cache(output_file)
+                return output_file
+        except OSError:
+            pass
         
-        # Synthesize
+        # Synthesize to a partial file so a failed download is never cached
+        partial_file = output_file.with_suffix(".part")
         communicate = self.edge_tts.Communicate(text, self.voice)
-        await communicate.save(str(output_file))
+        await communicate.save(str(partial_file))
+        os.replace(partial_file, output_file)
+        self._touch_cache(output_file)
         
         return output_file
     
+    async def _stream_speak(self, text: str) -> bool:
+        """
+        Play speech through ffplay as it is synthesized, caching the clip.
+        
+        Returns:
+            True if the text was spoken; False to fall back to file playback
+        """
+        output_file = self._cache_path(text)
+        if output_file.exists() and output_file.stat().st_size > 0:
+            return False
+        
+        partial_file = output_file.with_suffix(".part")
+        proc = await asyncio.create_subprocess_exec(
+            self._ffplay, "-nodisp", "-autoexit", "-loglevel", "quiet", "-i", "pipe:0",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        
+        started = False
+        try:
+            with open(partial_file, "wb") as cache_fp:
+                communicate = self.edge_tts.Communicate(text, self.voice)
+                async for chunk in communicate.stream():
+                    if chunk["type"] != "audio":
+                        continue
+                    proc.stdin.write(chunk["data"])
+                    cache_fp.write(chunk["data"])
+                    started = True
+                    await proc.stdin.drain()
+            
+            proc.stdin.close()
+            await proc.wait()
+        except Exception as e:
+            logger.error("Error streaming speech: %s", e)
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            try:
+                partial_file.unlink()
+            except OSError:
+                pass
+            # Replaying from the start is only safe if nothing was heard yet
+            return started
+        
+        os.replace(partial_file, output_file)
+        self._touch_cache(output_file)
+        return True
+    
     def synthesize(self, text: str) -> Path:
         """Synthesize speech and return path to audio file."""
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+        if not self._loop:
+            logger.error("Edge TTS not available")
+            return None
         
-        return loop.run_until_complete(self._synthesize_async(text))
+        future = asyncio.run_coroutine_threadsafe(self._synthesize_async(text), self._loop)
+        return future.result()
     
     def speak(self, text: str):
         """Synthesize and play speech."""
-        logger.info(f"Speaking: {text}")
+        logger.info("Speaking: %s", text)
+        
+        if self._loop and self._ffplay:
+            future = asyncio.run_coroutine_threadsafe(self._stream_speak(text), self._loop)
+            try:
+                if future.result():
+                    return
+            except Exception as e:
+                logger.error("Streaming playback unavailable: %s", e)
         
         audio_file = self.synthesize(text)
         if audio_file and audio_file.exists():
@@ -70,7 +176,7 @@ class TextToSpeech:
             playsound(str(audio_path), block=True)
                 
         except Exception as e:
-            logger.error(f"Error playing audio with playsound: {e}")
+            logger.error("Error playing audio with playsound: %s", e)
             try:
                 import platform
                 system = platform.system()
@@ -82,15 +188,19 @@ class TextToSpeech:
                 else:  # Linux
                     os.system(f"mpg123 {audio_path}")
             except Exception as fallback_error:
-                logger.error(f"Fallback audio playback failed: {fallback_error}")
+                logger.error("Fallback audio playback failed: %s", fallback_error)
     
     @staticmethod
     def list_voices():
-        """List available voices."""
+        """List available voices (fetched once per process)."""
         try:
-            import edge_tts
-            loop = asyncio.get_event_loop()
-            voices = loop.run_until_complete(edge_tts.list_voices())
-            return voices
-        except:
-            return []
+            return _fetch_voices()
+        except Exception:
+            return ()
+
+
+@functools.cache
+def _fetch_voices() -> tuple:
+    """Download the voice catalog; failures raise and so are not cached."""
+    import edge_tts
+    return tuple(asyncio.run(edge_tts.list_voices()))
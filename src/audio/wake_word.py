@@ -3,13 +3,51 @@ Wake word detection using openWakeWord.
 """
 import logging
 import time
-from threading import Thread
+from collections import deque
+from pathlib import Path
+from threading import Event, Thread
 from typing import Callable, Optional
 
 import numpy as np
 
+from src.utils.affinity import pin_current_thread
+
 logger = logging.getLogger("WakeWord")
 
+# Samples per 80 ms frame at 16 kHz
+FRAME_SAMPLES = 1280
+
+# Frames waiting for the model (~2 s at 80 ms each); the oldest drop on overflow
+FRAME_QUEUE_SIZE = 25
+
+# Suffix for dynamically quantized copies of custom wake word models
+QUANTIZED_SUFFIX = "_int8"
+
+
+def quantize_model(model_path: str) -> str:
+    """
+    Produce an int8 dynamically quantized copy of an ONNX wake word model.
+
+    The copy is written next to the source once and reused afterwards.
+
+    Args:
+        model_path: Path to a float32 .onnx model
+
+    Returns:
+        Path to the quantized model
+    """
+    source = Path(model_path)
+    if source.stem.endswith(QUANTIZED_SUFFIX):
+        return str(source)
+
+    target = source.with_name(f"{source.stem}{QUANTIZED_SUFFIX}{source.suffix}")
+    if not target.exists() or target.stat().st_mtime < source.stat().st_mtime:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+        logger.info("Quantized wake word model written to %s", target)
+    return str(target)
+
 
 class WakeWordDetector:
     """Detects wake words in microphone audio stream."""
@@ -20,8 +58,12 @@ class WakeWordDetector:
         callback: Optional[Callable] = None,
         threshold: float = 0.5,
         cooldown_seconds: float = 2.0,
+        model_path: Optional[str] = None,
+        cpu_slot: Optional[int] = None,
     ):
         self.wake_word = wake_word
+        self.model_path = model_path
+        self.cpu_slot = cpu_slot
         self.callback = callback
         self.threshold = threshold
         self.cooldown_seconds = cooldown_seconds
@@ -34,6 +76,15 @@ class WakeWordDetector:
         self.audio_stream = None
         self._last_trigger_ts = 0.0
         self.model_id = wake_word
+        self._wake_word_key = (wake_word or "").lower().replace(" ", "_")
+
+        # PortAudio's callback thread hands frames to the detection thread here
+        self._frames = deque(maxlen=FRAME_QUEUE_SIZE)
+        self._frame_ready = Event()
+
+        # int16 -> float32 conversion writes into one reused buffer
+        self._scratch = np.empty(FRAME_SAMPLES, dtype=np.float32)
+        self._scale = np.float32(1.0 / 32768.0)
 
         self.available = self._initialize_backend()
 
@@ -53,26 +104,66 @@ class WakeWordDetector:
             }
             self.model_id = alias_map.get(requested, requested)
 
+            # The detector runs around the clock; one ONNX Runtime thread per
+            # session keeps it under a single core
+            def load(models=None):
+                if models is None:
+                    return Model(inference_framework="onnx", ncpu=1)
+                return Model(wakeword_models=models, inference_framework="onnx", ncpu=1)
+
+            if self.model_path and self._load_custom_model(load):
+                self._warm_up()
+                return True
+
             try:
-                self.model = Model(wakeword_models=[self.model_id], inference_framework="onnx")
-                logger.info(f"Wake word model loaded: {self.model_id}")
+                self.model = load([self.model_id])
+                logger.info("Wake word model loaded: %s", self.model_id)
             except Exception as model_error:
-                logger.warning(f"Requested wake word model '{self.model_id}' unavailable: {model_error}")
+                logger.warning("Requested wake word model '%s' unavailable: %s", self.model_id, model_error)
                 try:
                     logger.info("Attempting to download openWakeWord model assets...")
                     oww_utils.download_models()
-                    self.model = Model(wakeword_models=[self.model_id], inference_framework="onnx")
-                    logger.info(f"Wake word model loaded after download: {self.model_id}")
+                    self.model = load([self.model_id])
+                    logger.info("Wake word model loaded after download: %s", self.model_id)
                 except Exception:
-                    self.model = Model(inference_framework="onnx")
+                    self.model = load()
                     self.model_id = ""
                     logger.info("Wake word model loaded with default openWakeWord model set")
 
+            self._warm_up()
             return True
         except Exception as error:
-            logger.warning(f"Wake word detector unavailable: {error}")
+            logger.warning("Wake word detector unavailable: %s", error)
             return False
 
+    def _load_custom_model(self, load) -> bool:
+        """Load a custom .onnx model, preferring its int8 quantized copy."""
+        path = self.model_path
+        try:
+            path = quantize_model(path)
+        except Exception as error:
+            logger.warning("Could not quantize wake word model, using float model: %s", error)
+
+        try:
+            self.model = load([path])
+        except Exception as error:
+            logger.warning("Custom wake word model '%s' unavailable: %s", path, error)
+            return False
+
+        # openWakeWord keys predictions by the model file's stem
+        self.model_id = Path(path).stem
+        logger.info("Wake word model loaded: %s", path)
+        return True
+
+    def _warm_up(self):
+        """Run one silent frame through the model, then clear its state."""
+        try:
+            self.model.predict(np.zeros(FRAME_SAMPLES, dtype=np.float32))
+            if hasattr(self.model, "reset"):
+                self.model.reset()
+        except Exception as error:
+            logger.debug("Wake word warm-up skipped: %s", error)
+
     def start(self):
         """Start wake word detection loop in a background thread."""
         if self.running:
@@ -89,8 +180,22 @@ class WakeWordDetector:
         logger.info("Wake word detector started")
 
     def _run_loop(self):
-        chunk_size = 1280
+        if self.cpu_slot is not None:
+            pin_current_thread(self.cpu_slot)
+
+        chunk_size = FRAME_SAMPLES
+
+        frames = self._frames
+        frame_ready = self._frame_ready
+        frames.clear()
+        pa_continue = self.pyaudio.paContinue
+
+        def on_audio(in_data, frame_count, time_info, status):
+            frames.append(in_data)
+            frame_ready.set()
+            return (None, pa_continue)
 
+        pa = None
         try:
             pa = self.pyaudio.PyAudio()
             self.audio_stream = pa.open(
@@ -99,38 +204,58 @@ class WakeWordDetector:
                 rate=16000,
                 input=True,
                 frames_per_buffer=chunk_size,
+                stream_callback=on_audio,
             )
 
             logger.info("Wake word microphone stream opened")
 
             while self.running:
-                raw_data = self.audio_stream.read(chunk_size, exception_on_overflow=False)
-                audio = np.frombuffer(raw_data, dtype=np.int16).astype(np.float32) / 32768.0
-
-                prediction = self.model.predict(audio)
-                score = self._extract_score(prediction)
-
-                if score >= self.threshold and (time.time() - self._last_trigger_ts) >= self.cooldown_seconds:
-                    self._last_trigger_ts = time.time()
-                    logger.info(f"Wake word detected (score={score:.3f})")
-                    if self.callback:
-                        try:
-                            self.callback()
-                        except Exception as callback_error:
-                            logger.error(f"Wake word callback failed: {callback_error}")
+                # Clear before draining so a frame queued mid-drain re-arms the event
+                if not frame_ready.wait(timeout=0.1):
+                    continue
+                frame_ready.clear()
+
+                while self.running:
+                    try:
+                        raw_data = frames.popleft()
+                    except IndexError:
+                        break
+                    self._process_frame(raw_data)
 
         except Exception as error:
-            logger.error(f"Wake word loop error: {error}")
+            logger.error("Wake word loop error: %s", error)
         finally:
             self._cleanup_stream()
+            if pa is not None:
+                pa.terminate()
+
+    def _process_frame(self, raw_data: bytes):
+        samples = np.frombuffer(raw_data, dtype=np.int16)
+        if len(samples) == len(self._scratch):
+            audio = np.multiply(samples, self._scale, out=self._scratch)
+        else:
+            audio = np.multiply(samples, self._scale, dtype=np.float32)
+
+        prediction = self.model.predict(audio)
+        score = self._extract_score(prediction)
+
+        if score >= self.threshold and (time.time() - self._last_trigger_ts) >= self.cooldown_seconds:
+            self._last_trigger_ts = time.time()
+            logger.info("Wake word detected (score=%.3f)", score)
+            if self.callback:
+                try:
+                    self.callback()
+                except Exception as callback_error:
+                    logger.error("Wake word callback failed: %s", callback_error)
 
     def _extract_score(self, prediction) -> float:
         if not prediction:
             return 0.0
 
         if isinstance(prediction, dict):
-            if self.model_id and self.model_id in prediction:
-                value = prediction[self.model_id]
+            # Fast path: the loaded model's id is the key in nearly every frame
+            value = prediction.get(self.model_id) if self.model_id else None
+            if value is not None:
                 if isinstance(value, (list, tuple)) and value:
                     return float(value[-1])
                 return float(value)
@@ -139,9 +264,8 @@ class WakeWordDetector:
                 str(key).lower(): value
                 for key, value in prediction.items()
             }
-            wake_word_key = (self.wake_word or "").lower().replace(" ", "_")
-            if wake_word_key in normalized_prediction:
-                value = normalized_prediction[wake_word_key]
+            if self._wake_word_key in normalized_prediction:
+                value = normalized_prediction[self._wake_word_key]
                 if isinstance(value, (list, tuple)) and value:
                     return float(value[-1])
                 return float(value)
@@ -183,5 +307,9 @@ class WakeWordDetector:
     def is_running(self) -> bool:
         return self.running
 
-    def __del__(self):
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
         self.stop()
@@ -2,214 +2,443 @@
 AI Backend Process - The "Brain" of the agent.
 Handles LLM inference, planning, and coordination.
 """
-from multiprocessing import Queue
-import time
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import queue
+import threading
+import uuid
 from pathlib import Path
+from src.core.config import config
+from src.core.ipc import Channel, PackedMessage
+from src.utils.affinity import pin_current_thread, unpin_current_thread
 from src.utils.logging_config import setup_logging
 
-# Setup logging with rotating file handler
-logger = setup_logging("AIBackend", "ai_backend.log")
+logger = logging.getLogger("AIBackend")
+
+_logging_configured = False
+
+
+def configure_logging():
+    """Attach the rotating file and console handlers, once per process."""
+    global _logging_configured
+    if not _logging_configured:
+        setup_logging("AIBackend", "ai_backend.log")
+        _logging_configured = True
+
+
+# Streaming STT: decode the recording so far at this cadence once at
+# least STREAM_MIN_SECONDS of undecoded audio has accumulated
+STREAM_INTERVAL_SECONDS = 2.0
+STREAM_MIN_SECONDS = 2.0
+
+# Spoken replies accepted while a dangerous plan awaits confirmation
+_CONFIRM_TOKENS = frozenset({"confirm", "yes", "proceed", "continue", "confirm execute"})
+_CANCEL_TOKENS = frozenset({"cancel", "stop", "no", "abort"})
+
+
+def _resp(status: str, message: str, /, **extra) -> dict:
+    """Build a response message for the GUI."""
+    response = {"type": "response", "status": status, "message": message}
+    if extra:
+        response.update(extra)
+    return response
+
+
+# Fully static responses, built and encoded once and returned by reference.
+# Responses are only sent over the response channel, never mutated.
+_RESP_OPERATIONAL = PackedMessage(_resp("success", "AI Backend is operational!"))
+_RESP_RECORDING_STARTED = PackedMessage(_resp("success", "Recording started"))
+_RESP_RECORDING_FAILED = PackedMessage(_resp("error", "Failed to start recording"))
+_RESP_NO_RECORDER = PackedMessage(_resp("error", "Audio recorder not available"))
+_RESP_NO_TRANSCRIPTION = PackedMessage(_resp("error", "Could not transcribe audio"))
+_RESP_NO_AUDIO = PackedMessage(_resp("error", "No audio recorded"))
+_RESP_NO_AUDIO_SYSTEMS = PackedMessage(_resp("error", "Audio systems not available"))
+_RESP_NO_PLAN = PackedMessage(_resp("error", "No plan to execute or executor not available"))
+_RESP_TASK_CANCELED = PackedMessage(_resp("success", "Dangerous task canceled"))
+_RESP_NO_PENDING_PLAN = PackedMessage(_resp("error", "No pending plan to execute"))
+
+
+class _StreamingTranscript:
+    """Background decoding state for one recording."""
+    
+    __slots__ = ("stop", "thread", "committed", "commit_pos")
+    
+    def __init__(self):
+        self.stop = threading.Event()
+        self.thread = None
+        self.committed = []
+        self.commit_pos = 0
+
+
+class _Component:
+    """
+    Backend component attribute that is filled in by a background initializer.
+    
+    Reading it blocks until its initializer has assigned a value (None when
+    the component is unavailable), so command handlers never observe a
+    half-started backend.
+    """
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        obj._component_ready[self.name].wait()
+        return obj._components[self.name]
+    
+    def __set__(self, obj, value):
+        obj._components[self.name] = value
+        obj._component_ready[self.name].set()
 
 
 class AIBackend:
     """AI Backend coordinator."""
     
-    def __init__(self, command_queue: Queue, response_queue: Queue):
-        """Initialize the AI backend."""
+    recorder = _Component()
+    stt = _Component()
+    tts = _Component()
+    wake_word = _Component()
+    planner = _Component()
+    memory = _Component()
+    executor = _Component()
+    plugin_manager = _Component()
+    scheduler = _Component()
+    file_watcher = _Component()
+    
+    def __init__(self, command_queue: Channel, response_queue: Channel, shutdown_event=None):
+        """
+        Initialize the AI backend.
+        
+        Args:
+            command_queue: Commands from the GUI
+            response_queue: Responses to the GUI
+            shutdown_event: Event the application sets to stop run()
+        """
+        configure_logging()
         self.command_queue = command_queue
         self.response_queue = response_queue
+        self.shutdown_event = shutdown_event or threading.Event()
         self.running = False
         self.pending_plan = None
         self.pending_command_text = ""
         self.pending_confirmations = 0
-        self.required_confirmations = 3
+        self.required_confirmations = int(config.get("safety.dangerous_confirmation_count", 3) or 3)
+        self.pin_threads = bool(config.get("performance.pin_threads", False))
+        
+        # Streaming transcription state for the current recording
+        self._stream = None
         
-        # Initialize audio components
-        self._init_audio()
+        # Transcription, planning and plan execution take seconds; one worker
+        # runs them in order so the command loop keeps answering meanwhile
+        # The worker is spawned lazily from the (possibly pinned) command loop,
+        # so it drops the inherited single-CPU mask before running anything
+        self._task_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="BackendTask", initializer=unpin_current_thread
+        )
         
-        # Initialize brain components
-        self._init_brain()
+        # Command type -> handler, looked up once per command
+        self._handlers = {
+            "test": self._handle_test,
+            "start_recording": self._handle_start_recording,
+            "stop_recording": self._handle_stop_recording,
+            "transcribe": self._handle_transcribe,
+            "execute_plan": self._handle_execute_plan,
+            "file_drop": self._handle_file_drop,
+        }
+        
+        # Components load in the background so "test" and other
+        # component-free commands are served while models are still loading
+        self._components = {}
+        self._component_ready = {
+            name: threading.Event()
+            for name, attr in vars(AIBackend).items()
+            if isinstance(attr, _Component)
+        }
+        self._speech_queue = queue.Queue()
+        self._warmup_thread = threading.Thread(target=self._warmup, name="BackendWarmup", daemon=True)
+        self._warmup_thread.start()
+    
+    def _warmup(self):
+        """Run every component initializer, then release waiting readers."""
+        # Components are independent and mostly I/O- or native-bound to load
+        # (model files, ONNX/CTranslate2 setup, imports), so load them in
+        # parallel; each initializer only assigns its own attributes.
+        initializers = (
+            self._init_recorder,
+            self._init_stt,
+            self._init_tts,
+            self._init_wake_word,
+            self._init_planner,
+            self._init_memory,
+            self._init_executor,
+            self._init_plugins,
+            self._init_services,
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=4, thread_name_prefix="BackendInit") as pool:
+                for future in [pool.submit(init) for init in initializers]:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error("Component initializer failed: %s", e, exc_info=True)
+        finally:
+            # Never leave a handler blocked on a component that failed to assign
+            for name, ready in self._component_ready.items():
+                if not ready.is_set():
+                    setattr(self, name, None)
         
         logger.info("AI Backend initialized")
     
-    def _init_audio(self):
-        """Initialize audio components."""
+    def _init_recorder(self):
+        """Initialize microphone capture."""
         try:
             from src.audio.recorder import AudioRecorder
+            self.recorder = AudioRecorder()
+        except Exception as e:
+            logger.error("Error initializing recorder: %s", e)
+            self.recorder = None
+    
+    def _init_stt(self):
+        """Initialize speech-to-text."""
+        try:
             from src.audio.stt import SpeechToText
-            from src.audio.tts import TextToSpeech
-            from src.audio.wake_word import WakeWordDetector
-            from src.core.config import config
             
-            self.recorder = AudioRecorder()
-            self.stt = SpeechToText(model_size="base")
+            self.stt = SpeechToText(
+                model_size=config.get("audio.stt_model", "base") or "base",
+                cpu_threads=int(config.get("audio.stt_cpu_threads", 0) or 0),
+                beam_size=int(config.get("audio.stt_beam_size", 1) or 1),
+            )
+        except Exception as e:
+            logger.error("Error initializing STT: %s", e)
+            self.stt = None
+    
+    def _init_tts(self):
+        """Initialize text-to-speech and its playback worker."""
+        try:
+            from src.audio.tts import TextToSpeech
             self.tts = TextToSpeech()
-            self.wake_word = None
-
-            self.required_confirmations = int(config.get("safety.dangerous_confirmation_count", 3) or 3)
+        except Exception as e:
+            logger.error("Error initializing TTS: %s", e)
+            self.tts = None
+            return
+        
+        # Playback takes seconds; a worker keeps it off the command path
+        threading.Thread(target=self._speech_worker, name="TTSWorker", daemon=True).start()
+    
+    def _speech_worker(self):
+        """Speak queued phrases in order until the shutdown sentinel arrives."""
+        if self.pin_threads:
+            pin_current_thread(1)
+        while True:
+            phrase = self._speech_queue.get()
+            if phrase is None:
+                return
+            try:
+                self.tts.speak(phrase)
+            except Exception as e:
+                logger.error("Error speaking: %s", e)
+    
+    def _speak(self, phrase: str):
+        """Queue a phrase for speech without waiting for playback."""
+        if self.tts:
+            self._speech_queue.put_nowait(phrase)
+    
+    def _clear_speech(self):
+        """Drop phrases that have not started playing yet."""
+        try:
+            while True:
+                self._speech_queue.get_nowait()
+        except queue.Empty:
+            pass
+    
+    def _init_wake_word(self):
+        """Initialize and start the wake word detector if enabled."""
+        try:
+            from src.audio.wake_word import WakeWordDetector
 
             wake_word_enabled = bool(config.get("audio.wake_word_enabled", True))
             wake_word = config.get("audio.wake_word", "hey_jarvis")
 
             if wake_word_enabled:
-                self.wake_word = WakeWordDetector(
+                detector = WakeWordDetector(
                     wake_word=wake_word,
                     callback=self._on_wake_word_detected,
+                    model_path=config.get("audio.wake_word_model_path", "") or None,
+                    cpu_slot=2 if self.pin_threads else None,
                 )
-                self.wake_word.start()
-            
-            logger.info("Audio components initialized")
+                # Shutdown may have been requested while the model loaded
+                if self.shutdown_event.is_set():
+                    detector = None
+                else:
+                    detector.start()
+                self.wake_word = detector
+            else:
+                self.wake_word = None
         except Exception as e:
-            logger.error(f"Error initializing audio: {e}")
-            self.recorder = None
-            self.stt = None
-            self.tts = None
+            logger.error("Error initializing wake word: %s", e)
             self.wake_word = None
 
+    def _emit(self, message: dict):
+        """Send a response or event to the GUI."""
+        self.response_queue.put(message)
+
     def _on_wake_word_detected(self):
         """Handle wake word detection callback."""
         try:
-            self.response_queue.put({
+            self._emit({
                 "type": "event",
                 "event": "wake_word_detected",
                 "status": "success",
                 "message": "Wake word detected"
             })
         except Exception as e:
-            logger.error(f"Failed to emit wake word event: {e}")
+            logger.error("Failed to emit wake word event: %s", e)
     
-    def _init_brain(self):
-        """Initialize LLM and planning components."""
+    def _init_planner(self):
+        """Initialize the LLM planner."""
         try:
             from src.llm.planner import planner
-            from src.memory.manager import memory
-            from src.actions.executor import action_executor
-            from src.plugins.plugin_manager import PluginManager
-            from src.scheduler.task_scheduler import task_scheduler
-            from src.watcher.file_watcher import file_watcher
-            
+            # Load the LLM provider now, in the warmup pool, not on the first command
+            planner.llm.is_available()
             self.planner = planner
+        except Exception as e:
+            logger.error("Error initializing planner: %s", e)
+            self.planner = None
+    
+    def _init_memory(self):
+        """Initialize long-term memory."""
+        try:
+            from src.memory.manager import memory
             self.memory = memory
+        except Exception as e:
+            logger.error("Error initializing memory: %s", e)
+            self.memory = None
+    
+    def _init_executor(self):
+        """Initialize the action executor."""
+        try:
+            from src.actions.executor import action_executor
             self.executor = action_executor
-            
-            # Initialize plugin system
+        except Exception as e:
+            logger.error("Error initializing executor: %s", e)
+            self.executor = None
+    
+    def _init_plugins(self):
+        """Initialize the plugin system."""
+        try:
+            from src.plugins.plugin_manager import PluginManager
             self.plugin_manager = PluginManager(skills_dir="./skills")
             self.plugin_manager.load_all_skills()
+        except Exception as e:
+            logger.error("Error initializing plugins: %s", e)
+            self.plugin_manager = None
+    
+    def _init_services(self):
+        """Initialize the scheduler and file watcher."""
+        try:
+            from src.scheduler.task_scheduler import task_scheduler
+            from src.watcher.file_watcher import file_watcher
             
-            # Initialize scheduler
             self.scheduler = task_scheduler
-            
-            # Initialize file watcher
             self.file_watcher = file_watcher
-            
-            logger.info("Brain components initialized")
         except Exception as e:
-            logger.error(f"Error initializing brain: {e}")
-            self.planner = None
-            self.memory = None
-            self.executor = None
-            self.plugin_manager = None
+            logger.error("Error initializing services: %s", e)
             self.scheduler = None
             self.file_watcher = None
     
     def run(self):
         """Main loop for the AI backend."""
         self.running = True
+        if self.pin_threads:
+            pin_current_thread(0)
         logger.info("AI Backend started - waiting for commands...")
         
         try:
-            while self.running:
-                # Check for commands from GUI
-                if not self.command_queue.empty():
-                    command = self.command_queue.get()
-                    logger.info(f"Received command: {command}")
-                    
-                    # Process command
-                    response = self._process_command(command)
-                    
-                    # Send response back to GUI
-                    self.response_queue.put(response)
+            while self.running and not self.shutdown_event.is_set():
+                # Block until the GUI sends a command; the timeout only
+                # bounds how long a shutdown request goes unnoticed
+                try:
+                    commands = [self.command_queue.get(timeout=0.5)]
+                except queue.Empty:
+                    continue
                 
-                time.sleep(0.1)  # Prevent CPU spinning
+                # Drain a burst so its responses go back in one send
+                while True:
+                    try:
+                        commands.append(self.command_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                responses = []
+                for command in commands:
+                    logger.info("Received command: %s", command)
+                    responses.append(self._process_command(command))
+                
+                # Send responses back to GUI
+                self.response_queue.put_many(responses)
                 
-        except KeyboardInterrupt:
-            logger.info("Shutdown signal received")
         except Exception as e:
-            logger.error(f"Error in AI Backend: {e}", exc_info=True)
+            logger.error("Error in AI Backend: %s", e, exc_info=True)
         finally:
-            if getattr(self, "wake_word", None):
-                self.wake_word.stop()
+            self._task_pool.shutdown(wait=False, cancel_futures=True)
+            # Read components without blocking; warmup may still be loading them
+            wake_word = self._components.get("wake_word")
+            if wake_word:
+                wake_word.stop()
+            # Also stops a TTS worker that warmup has yet to start
+            self._speech_queue.put(None)
             self.running = False
             logger.info("AI Backend stopped")
 
     def _handle_confirmation(self, text: str) -> dict:
         """Process confirmation/cancel flow for dangerous pending plans."""
-        normalized = text.strip().lower()
-        confirm_tokens = {"confirm", "yes", "proceed", "continue", "confirm execute"}
-        cancel_tokens = {"cancel", "stop", "no", "abort"}
+        normalized = text.strip().casefold()
 
-        if normalized in cancel_tokens:
+        if normalized in _CANCEL_TOKENS:
             self.pending_plan = None
             self.pending_command_text = ""
             self.pending_confirmations = 0
-            if self.tts:
-                self.tts.speak("Dangerous task canceled.")
-            return {
-                "type": "response",
-                "status": "success",
-                "message": "Dangerous task canceled"
-            }
+            self._speak("Dangerous task canceled.")
+            return _RESP_TASK_CANCELED
 
-        if normalized in confirm_tokens:
+        if normalized in _CONFIRM_TOKENS:
             self.pending_confirmations += 1
             remaining = self.required_confirmations - self.pending_confirmations
 
             if remaining > 0:
-                if self.tts:
-                    self.tts.speak(f"Confirmation {self.pending_confirmations} accepted. Say confirm {remaining} more time{'s' if remaining > 1 else ''}.")
-                return {
-                    "type": "response",
-                    "status": "success",
-                    "message": f"Confirmation {self.pending_confirmations}/{self.required_confirmations} received",
-                    "awaiting_confirmation": True,
-                    "remaining_confirmations": remaining
-                }
+                self._speak(f"Confirmation {self.pending_confirmations} accepted. Say confirm {remaining} more time{'s' if remaining > 1 else ''}.")
+                return _resp(
+                    "success",
+                    f"Confirmation {self.pending_confirmations}/{self.required_confirmations} received",
+                    awaiting_confirmation=True,
+                    remaining_confirmations=remaining
+                )
 
             plan = self.pending_plan or []
             self.pending_plan = None
             self.pending_command_text = ""
             self.pending_confirmations = 0
 
-            if self.tts:
-                self.tts.speak(f"Final confirmation received. Executing {len(plan)} steps.")
+            self._speak(f"Final confirmation received. Executing {len(plan)} steps.")
 
             if self.executor and plan:
                 result = self.executor.execute_plan(plan)
                 success = result.get("success", False)
                 message = f"Executed {result.get('successful_steps', 0)}/{result.get('total_steps', 0)} steps"
-                return {
-                    "type": "response",
-                    "status": "success" if success else "partial",
-                    "message": message,
-                    "result": result
-                }
-
-            return {
-                "type": "response",
-                "status": "error",
-                "message": "No pending plan to execute"
-            }
+                return _resp("success" if success else "partial", message, result=result)
 
-        if self.tts:
-            self.tts.speak("Please say confirm or cancel.")
-
-        return {
-            "type": "response",
-            "status": "error",
-            "message": "Awaiting confirmation. Say 'confirm' or 'cancel'.",
-            "awaiting_confirmation": True,
-            "remaining_confirmations": self.required_confirmations - self.pending_confirmations
-        }
+            return _RESP_NO_PENDING_PLAN
+
+        self._speak("Please say confirm or cancel.")
+
+        return _resp(
+            "error",
+            "Awaiting confirmation. Say 'confirm' or 'cancel'.",
+            awaiting_confirmation=True,
+            remaining_confirmations=self.required_confirmations - self.pending_confirmations
+        )
 
     def _process_transcribed_text(self, text: str) -> dict:
         """Route transcribed text through plugin/planner pipeline."""
@@ -232,15 +461,13 @@ class AIBackend:
         if plugin_result:
             logger.info("Command handled by plugin")
 
-            if self.tts:
-                self.tts.speak(plugin_result.get("response", "Done"))
+            self._speak(plugin_result.get("response", "Done"))
 
-            return {
-                "type": "response",
-                "status": "success" if plugin_result.get("success") else "error",
-                "message": plugin_result.get("response", ""),
-                "plugin_data": plugin_result.get("data")
-            }
+            return _resp(
+                "success" if plugin_result.get("success") else "error",
+                plugin_result.get("response", ""),
+                plugin_data=plugin_result.get("data")
+            )
 
         if self.planner:
             plan = self.planner.create_plan(text)
@@ -253,194 +480,213 @@ class AIBackend:
                     self.pending_command_text = text
                     self.pending_confirmations = 0
 
-                    if self.tts:
-                        self.tts.speak(
-                            f"Dangerous action detected for '{text}'. "
-                            f"Say confirm {self.required_confirmations} times to proceed, or say cancel."
-                        )
-
-                    return {
-                        "type": "response",
-                        "status": "success",
-                        "message": (
-                            f"Dangerous action requires {self.required_confirmations} confirmations"
-                        ),
-                        "needs_confirmation": True,
-                        "awaiting_confirmation": True,
-                        "remaining_confirmations": self.required_confirmations
-                    }
-
-                if self.tts:
-                    self.tts.speak(f"Understood: {text}. Executing now.")
-
-                return {
-                    "type": "response",
-                    "status": "success",
-                    "message": f"Command: {text}",
-                    "plan": plan,
-                    "needs_confirmation": False
-                }
+                    self._speak(
+                        f"Dangerous action detected for '{text}'. "
+                        f"Say confirm {self.required_confirmations} times to proceed, or say cancel."
+                    )
+
+                    return _resp(
+                        "success",
+                        f"Dangerous action requires {self.required_confirmations} confirmations",
+                        needs_confirmation=True,
+                        awaiting_confirmation=True,
+                        remaining_confirmations=self.required_confirmations
+                    )
+
+                self._speak(f"Understood: {text}. Executing now.")
+
+                return _resp("success", f"Command: {text}", plan=plan, needs_confirmation=False)
 
             plan_error = getattr(self.planner, "last_error", "")
             user_message = "Could not create action plan"
 
-            if "ollama model not found" in plan_error.lower() or "model not found" in plan_error.lower():
-                user_message = "Ollama model missing. Run: ollama pull llama3.2"
+            if "gguf model not found" in plan_error.lower():
+                user_message = "GGUF model missing. Set llm.model_path to a local .gguf file"
+            elif "ollama model not found" in plan_error.lower() or "model not found" in plan_error.lower():
+                user_message = "Ollama model missing. Run: ollama pull llama3.2, or set llm.provider to llamacpp with a local GGUF model"
 
-            if self.tts:
-                self.tts.speak(user_message)
+            self._speak(user_message)
 
-            return {
-                "type": "response",
-                "status": "error",
-                "message": user_message
-            }
+            return _resp("error", user_message)
 
-        if self.tts:
-            self.tts.speak(f"I heard: {text}")
+        self._speak(f"I heard: {text}")
 
-        return {
-            "type": "response",
-            "status": "success",
-            "message": f"Transcribed: {text}"
-        }
+        return _resp("success", f"Transcribed: {text}")
     
     def _process_command(self, command: dict) -> dict:
         """Process incoming commands."""
         cmd_type = command.get("type", "unknown")
+        return self._handlers.get(cmd_type, self._handle_unknown)(command)
+    
+    def _handle_test(self, command: dict) -> dict:
+        return _RESP_OPERATIONAL
+    
+    def _handle_start_recording(self, command: dict) -> dict:
+        # Start audio recording; queued speech is stale once the user talks
+        self._clear_speech()
+        if self.recorder:
+            success = self.recorder.start_recording()
+            if success:
+                self._start_streaming_stt()
+                return _RESP_RECORDING_STARTED
+            else:
+                return _RESP_RECORDING_FAILED
+        else:
+            return _RESP_NO_RECORDER
+    
+    def _handle_stop_recording(self, command: dict) -> dict:
+        # Stop recording; transcription and planning finish in the background
+        if not (self.recorder and self.stt):
+            return _RESP_NO_AUDIO_SYSTEMS
         
-        if cmd_type == "test":
-            return {
-                "type": "response",
-                "status": "success",
-                "message": "AI Backend is operational!"
-            }
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.stop.set()
+        audio_data = self.recorder.stop_recording()
+        if len(audio_data) == 0:
+            return _RESP_NO_AUDIO
         
-        elif cmd_type == "start_recording":
-            # Start audio recording
-            if self.recorder:
-                success = self.recorder.start_recording()
-                if success:
-                    return {
-                        "type": "response",
-                        "status": "success",
-                        "message": "Recording started"
-                    }
-                else:
-                    return {
-                        "type": "response",
-                        "status": "error",
-                        "message": "Failed to start recording"
-                    }
-            else:
-                return {
-                    "type": "response",
-                    "status": "error",
-                    "message": "Audio recorder not available"
-                }
+        return self._defer(self._transcribe_recording, audio_data, stream)
+    
+    def _transcribe_recording(self, audio_data, stream) -> dict:
+        """Transcribe a stopped recording and act on the text."""
+        # Transcribe; with streaming on, only the undecoded tail is left
+        text = self._finish_streaming_stt(audio_data, stream)
+        if not text:
+            return _RESP_NO_TRANSCRIPTION
         
-        elif cmd_type == "stop_recording":
-            # Stop recording and transcribe
-            if self.recorder and self.stt:
-                audio_data = self.recorder.stop_recording()
-                
-                if len(audio_data) > 0:
-                    # Transcribe
-                    text = self.stt.transcribe_numpy(audio_data)
-                    
-                    if text:
-                        logger.info(f"Transcribed: {text}")
-
-                        return self._process_transcribed_text(text)
-                    else:
-                        return {
-                            "type": "response",
-                            "status": "error",
-                            "message": "Could not transcribe audio"
-                        }
-                else:
-                    return {
-                        "type": "response",
-                        "status": "error",
-                        "message": "No audio recorded"
-                    }
-            else:
-                return {
-                    "type": "response",
-                    "status": "error",
-                    "message": "Audio systems not available"
-                }
+        logger.info("Transcribed: %s", text)
+        return self._process_transcribed_text(text)
+    
+    def _defer(self, task, *args) -> dict:
+        """Run a slow handler on the task worker and acknowledge immediately."""
+        request_id = uuid.uuid4().hex
         
-        elif cmd_type == "transcribe":
-            # Handle transcription (will be implemented later)
-            text = command.get("text", "")
-            return {
-                "type": "response",
-                "status": "success",
-                "message": f"Processing: {text}"
-            }
+        def send_result(future):
+            try:
+                response = future.result()
+            except Exception as e:
+                logger.error("Background task failed: %s", e, exc_info=True)
+                response = _resp("error", f"Task failed: {e}")
+            self._emit({**response, "request_id": request_id})
         
-        elif cmd_type == "execute_plan":
-            # Execute an action plan
-            plan = command.get("plan", [])
-            
-            if self.executor and plan:
-                if self.tts:
-                    self.tts.speak(f"Executing {len(plan)} steps.")
-
-                result = self.executor.execute_plan(plan)
-                
-                success = result.get("success", False)
-                message = f"Executed {result.get('successful_steps', 0)}/{result.get('total_steps', 0)} steps"
-                
-                # Speak result
-                if self.tts:
-                    if success:
-                        self.tts.speak(f"Task completed successfully. {message}.")
-                    else:
-                        self.tts.speak(f"Task completed with some errors. {message}.")
-                
-                return {
-                    "type": "response",
-                    "status": "success" if success else "partial",
-                    "message": message,
-                    "result": result
-                }
-            else:
-                return {
-                    "type": "response",
-                    "status": "error",
-                    "message": "No plan to execute or executor not available"
-                }
+        self._task_pool.submit(task, *args).add_done_callback(send_result)
+        return _resp("accepted", "Processing", request_id=request_id)
+    
+    def _start_streaming_stt(self):
+        """Begin decoding the recording in the background while it runs."""
+        self._stream = None
+        if not (self.stt and config.get("audio.streaming_stt", True)):
+            return
+        
+        stream = _StreamingTranscript()
+        stream.thread = threading.Thread(
+            target=self._streaming_stt_worker,
+            args=(stream,),
+            name="StreamingSTT",
+            daemon=True
+        )
+        self._stream = stream
+        stream.thread.start()
+    
+    def _streaming_stt_worker(self, stream: _StreamingTranscript):
+        """
+        Decode undecoded audio periodically, committing all but the last segment.
+        
+        The last segment may be cut mid-word, so it is decoded again next
+        round; committed text and the commit position only move forward.
+        """
+        # Started from the command loop; decode on all CPUs, not its pinned one
+        unpin_current_thread()
+        sample_rate = self.recorder.sample_rate
+        min_samples = int(STREAM_MIN_SECONDS * sample_rate)
+        stop = stream.stop
         
-        elif cmd_type == "file_drop":
-            # Handle file drop event
-            files = command.get("files", [])
-            message = command.get("message", "")
+        while not stop.wait(STREAM_INTERVAL_SECONDS):
+            audio = self.recorder.snapshot(stream.commit_pos)
+            # Stop is set before the recorder is, so a snapshot taken after
+            # it may already belong to the next recording
+            if stop.is_set() or len(audio) < min_samples:
+                continue
             
-            logger.info(f"Processing file drop: {len(files)} files")
+            segments = self.stt.transcribe_segments(audio, sample_rate)
+            if not segments:
+                continue
             
-            # Store in memory
-            if self.memory:
-                self.memory.remember(
-                    content=f"User dropped files: {', '.join(files)}",
-                    metadata={"type": "file_drop", "files": files}
-                )
+            *done, tail = segments
+            if done:
+                stream.committed.extend(text for _, _, text in done)
+                stream.commit_pos += int(done[-1][1] * sample_rate)
             
-            # Speak acknowledgment
-            if self.tts:
-                self.tts.speak(f"I received {len(files)} file{'s' if len(files) > 1 else ''}. What would you like me to do with them?")
+            # The final transcript follows shortly once recording has stopped
+            if stop.is_set():
+                return
             
-            return {
-                "type": "response",
+            self._emit({
+                "type": "event",
+                "event": "partial_transcript",
                 "status": "success",
-                "message": f"Received {len(files)} file(s)",
-                "files": files
-            }
+                "message": " ".join(stream.committed + [tail[2]]).strip()
+            })
+    
+    def _finish_streaming_stt(self, audio_data, stream) -> str:
+        """Complete the transcript for a stopped recording."""
+        if stream is None:
+            return self.stt.transcribe_numpy(audio_data)
+        
+        stream.thread.join()
+        tail = self.stt.transcribe_numpy(audio_data[stream.commit_pos:])
+        return " ".join(stream.committed + [tail]).strip()
+    
+    def _handle_transcribe(self, command: dict) -> dict:
+        # Handle transcription (will be implemented later)
+        text = command.get("text", "")
+        return _resp("success", f"Processing: {text}")
+    
+    def _handle_execute_plan(self, command: dict) -> dict:
+        # Execute an action plan
+        plan = command.get("plan", [])
+        
+        if self.executor and plan:
+            return self._defer(self._run_plan, plan)
+        else:
+            return _RESP_NO_PLAN
+    
+    def _run_plan(self, plan: list) -> dict:
+        """Execute a plan and report how many steps succeeded."""
+        self._speak(f"Executing {len(plan)} steps.")
+        
+        result = self.executor.execute_plan(plan)
         
+        success = result.get("success", False)
+        message = f"Executed {result.get('successful_steps', 0)}/{result.get('total_steps', 0)} steps"
+        
+        # Speak result
+        if success:
+            self._speak(f"Task completed successfully. {message}.")
         else:
-            return {
-                "type": "response",
-                "status": "error",
-                "message": f"Unknown command type: {cmd_type}"
-            }
+            self._speak(f"Task completed with some errors. {message}.")
+        
+        return _resp("success" if success else "partial", message, result=result)
+    
+    def _handle_file_drop(self, command: dict) -> dict:
+        # Handle file drop event
+        files = command.get("files", [])
+        message = command.get("message", "")
+        
+        logger.info("Processing file drop: %s files", len(files))
+        
+        # Store in memory
+        if self.memory:
+            self.memory.remember(
+                content=[f"User dropped file: {path}" for path in files],
+                metadata={"type": "file_drop"}
+            )
+        
+        # Speak acknowledgment
+        self._speak(f"I received {len(files)} file{'s' if len(files) > 1 else ''}. What would you like me to do with them?")
+        
+        return _resp("success", f"Received {len(files)} file(s)", files=files)
+    
+    def _handle_unknown(self, command: dict) -> dict:
+        return _resp("error", f"Unknown command type: {command.get('type', 'unknown')}")
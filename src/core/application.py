@@ -3,32 +3,63 @@ Main application orchestrator with multi-process architecture.
 """
 import sys
 import multiprocessing as mp
-from multiprocessing import Process, Queue
+from multiprocessing import Process
+from multiprocessing.connection import wait
 import signal
+import socket
 import time
 
+from src.core.ipc import Channel
 
-def run_gui_frontend(cmd_queue: Queue, resp_queue: Queue):
+
+def _apply_core_split(upper: bool):
+    """Keep the GUI and backend processes on separate halves of the CPUs."""
+    from src.core.config import config
+    if not config.get("performance.split_cores", False):
+        return
+    
+    from src.utils.affinity import cpu_half, raise_process_priority, set_process_affinity
+    set_process_affinity(cpu_half(upper))
+    if upper:
+        # STT/TTS/LLM work is latency-sensitive; give it the edge over background apps
+        raise_process_priority()
+
+
+def _reset_child_signals():
+    """Leave Ctrl+C to the parent, which coordinates shutdown, and let terminate() kill."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def run_gui_frontend(cmd_queue: Channel, resp_queue: Channel, shutdown_event):
     """Process entrypoint for GUI frontend."""
+    _reset_child_signals()
     try:
+        _apply_core_split(upper=False)
         from src.gui.main_window import run_gui
-        run_gui(cmd_queue, resp_queue)
+        run_gui(cmd_queue, resp_queue, shutdown_event)
     except Exception as e:
         print(f"[✗] GUI Process Error: {e}")
         import traceback
         traceback.print_exc()
 
 
-def run_ai_backend(cmd_queue: Queue, resp_queue: Queue):
+def run_ai_backend(cmd_queue: Channel, resp_queue: Channel, shutdown_event):
     """Process entrypoint for AI backend."""
+    _reset_child_signals()
     try:
-        from src.core.ai_backend import AIBackend
-        backend = AIBackend(cmd_queue, resp_queue)
+        _apply_core_split(upper=True)
+        from src.core.ai_backend import AIBackend, configure_logging
+        configure_logging()
+        backend = AIBackend(cmd_queue, resp_queue, shutdown_event)
         backend.run()
     except Exception as e:
         print(f"[✗] AI Backend Error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        from src.utils.logging_config import stop_logging
+        stop_logging()
 
 
 class Application:
@@ -38,8 +69,11 @@ class Application:
         """Initialize the application."""
         self.gui_process = None
         self.ai_process = None
-        self.command_queue = Queue()  # GUI -> AI
-        self.response_queue = Queue()  # AI -> GUI
+        self.command_queue = Channel()  # GUI -> AI
+        self.response_queue = Channel()  # AI -> GUI
+        # Set once to ask both processes to finish up and exit on their own
+        self.shutdown_event = mp.Event()
+        self._shutdown_requested = False
         
     def run(self):
         """Start the application with multi-process architecture."""
@@ -54,7 +88,7 @@ class Application:
             print("[*] Starting AI Backend Process...")
             self.ai_process = Process(
                 target=run_ai_backend,
-                args=(self.command_queue, self.response_queue),
+                args=(self.command_queue, self.response_queue, self.shutdown_event),
                 name="AI_Backend"
             )
             self.ai_process.start()
@@ -63,7 +97,7 @@ class Application:
             print("[*] Starting GUI Frontend Process...")
             self.gui_process = Process(
                 target=run_gui_frontend,
-                args=(self.command_queue, self.response_queue),
+                args=(self.command_queue, self.response_queue, self.shutdown_event),
                 name="GUI_Frontend"
             )
             self.gui_process.start()
@@ -71,31 +105,63 @@ class Application:
             print("[✓] All processes started successfully.")
             print("[*] Press Ctrl+C to shutdown.\n")
             
-            # Wait for processes
-            self.gui_process.join()
+            # Wait for the GUI to close or a shutdown signal
+            self._wait_for_exit()
             
-        except KeyboardInterrupt:
-            print("\n[*] Shutdown signal received...")
         except Exception as e:
             print(f"\n[✗] Error: {e}")
         finally:
             self._cleanup()
     
+    def _wait_for_exit(self):
+        """
+        Block in one OS wait until the GUI process exits or a signal arrives.
+        
+        Signals are delivered through a wakeup socket (sockets are what
+        set_wakeup_fd accepts on Windows), so nothing polls and cleanup
+        runs from normal control flow instead of inside a signal handler.
+        """
+        wake_reader, wake_writer = socket.socketpair()
+        wake_reader.setblocking(False)
+        wake_writer.setblocking(False)
+        previous_fd = signal.set_wakeup_fd(wake_writer.fileno(), warn_on_full_buffer=False)
+        
+        try:
+            while not self._shutdown_requested:
+                ready = wait([self.gui_process.sentinel, wake_reader])
+                if self.gui_process.sentinel in ready:
+                    return
+                try:
+                    wake_reader.recv(512)
+                except BlockingIOError:
+                    pass
+        finally:
+            signal.set_wakeup_fd(previous_fd)
+            wake_reader.close()
+            wake_writer.close()
+    
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals."""
         print("\n[*] Shutdown signal received...")
-        self._cleanup()
-        sys.exit(0)
+        self._shutdown_requested = True
     
     def _cleanup(self):
         """Clean up processes."""
         print("[*] Cleaning up processes...")
         
+        # Let both processes release audio devices and models and flush logs;
+        # terminate() skips all of that, so it is only the fallback
+        self.shutdown_event.set()
+        
+        if self.ai_process:
+            self.ai_process.join(timeout=5)
         if self.ai_process and self.ai_process.is_alive():
             print("[*] Terminating AI Backend...")
             self.ai_process.terminate()
             self.ai_process.join(timeout=2)
         
+        if self.gui_process:
+            self.gui_process.join(timeout=2)
         if self.gui_process and self.gui_process.is_alive():
             print("[*] Terminating GUI Frontend...")
             self.gui_process.terminate()
@@ -1,10 +1,131 @@
 """
 Configuration management for openNova.
 """
+import copy
+import hashlib
 import os
 import json
+import logging
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Final, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("Config")
+
+# Bursts of set() calls within this window are written to disk once
+SAVE_DELAY_SECONDS = 0.5
+
+# Built once; Config hands out deep copies so callers may mutate freely
+_DEFAULT_CONFIG: Final[Dict[str, Any]] = {
+    "llm": {
+        "provider": "ollama",  # ollama, openai, anthropic, google, llamacpp
+        "model": "llama3.2",
+        "api_key": "",
+        "base_url": "http://localhost:11434",
+        "keep_alive": "30m",  # Ollama: duration string, or seconds (-1 = forever, 0 = unload)
+        "model_path": "",  # llamacpp: local GGUF file, e.g. llama3.2-3b-instruct-q4_k_m.gguf
+        "n_gpu_layers": -1,  # llamacpp: -1 offloads every layer when a GPU build is installed
+        "n_ctx": 2048
+    },
+    "audio": {
+        "wake_word_enabled": True,
+        "wake_word": "hey agent",
+        "wake_word_model_path": "",  # custom .onnx model; an int8 copy is made on first load
+        "hotkey": "ctrl+space",
+        "stt_model": "base",  # tiny, base, small, medium, large
+        "stt_cpu_threads": 0,  # 0 = half the CPU cores
+        "stt_beam_size": 1,  # 1 = greedy decoding
+        "streaming_stt": True,  # transcribe while recording
+        "tts_voice": "en-US-AriaNeural"
+    },
+    "vision": {
+        "primary_method": "accessibility",  # accessibility, vision, hybrid
+        "fallback_to_vision": True
+    },
+    "ui": {
+        "theme": "dark",
+        "position": "top-right",
+        "opacity": 0.95
+    },
+    "safety": {
+        "confirm_dangerous_actions": True,
+        "dangerous_confirmation_count": 3,
+        "blacklist_commands": [
+            "format",
+            "rm -rf /",
+            "del /f /s /q C:\\",
+            "Format-Volume"
+        ]
+    },
+    "memory": {
+        "enabled": True,
+        "max_history": 1000
+    },
+    "scheduler": {
+        "enabled": True
+    },
+    "performance": {
+        "pin_threads": False,  # pin backend loop, TTS and wake word to separate cores
+        "split_cores": False  # GUI on the lower half of the CPUs, backend on the upper half
+    }
+}
+
+
+# Keys whose values may take other types than their default's
+_ALLOWED_TYPES: Final = {
+    "llm.keep_alive": (str, int),
+}
+
+
+def _matches_type(value: Any, default: Any, allowed: Optional[tuple] = None) -> bool:
+    """Check a loaded value against the type of its default, or the allowed types."""
+    if allowed is not None:
+        return isinstance(value, allowed) and not isinstance(value, bool)
+    if isinstance(default, bool):
+        return isinstance(value, bool)
+    if isinstance(default, (int, float)):
+        # Whole numbers are fine where a float is expected, booleans never are
+        numeric = (int, float) if isinstance(default, float) else int
+        return isinstance(value, numeric) and not isinstance(value, bool)
+    return isinstance(value, type(default))
+
+
+def _conform(settings: Dict[str, Any], schema: Dict[str, Any], prefix: str = ""):
+    """
+    Validate loaded settings against the defaults once, in place.
+    
+    Missing keys are filled from the defaults and values of the wrong type
+    are replaced by them, so readers can trust the types they get back.
+    Keys the defaults do not know about are left alone.
+    """
+    for key, default in schema.items():
+        path = f"{prefix}{key}"
+        if key not in settings:
+            settings[key] = copy.deepcopy(default)
+        elif isinstance(default, dict) and isinstance(settings[key], dict):
+            _conform(settings[key], default, f"{path}.")
+        elif not _matches_type(settings[key], default, _ALLOWED_TYPES.get(path)):
+            logger.warning("Config value %s has the wrong type, using default %r", path, default)
+            settings[key] = copy.deepcopy(default)
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    """Parse a JSON file, with orjson when installed."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dump_json(settings: Dict[str, Any]) -> bytes:
+    """Serialize settings as indented JSON, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(settings, option=orjson.OPT_INDENT_2)
+    return json.dumps(settings, indent=2).encode("utf-8")
 
 
 class Config:
@@ -15,14 +136,37 @@ class Config:
         self.config_file = self.config_dir / "config.json"
         self.config_dir.mkdir(exist_ok=True)
         
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._saved_digest = None
         self.settings = self._load_config()
+        self._flat = self._flatten(self.settings)
+        # What's on disk now; a set() restoring a loaded value needn't rewrite it
+        self._saved_digest = self._digest(_dump_json(self.settings))
+    
+    @staticmethod
+    def _digest(data: bytes) -> bytes:
+        """Fingerprint serialized settings to detect unchanged saves."""
+        return hashlib.blake2b(data, digest_size=16).digest()
+    
+    @staticmethod
+    def _flatten(settings: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+        """Map every dotted key path (sections included) to its value."""
+        flat = {}
+        for key, value in settings.items():
+            path = f"{prefix}{key}"
+            flat[path] = value
+            if isinstance(value, dict):
+                flat.update(Config._flatten(value, f"{path}."))
+        return flat
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create default."""
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r') as f:
-                    return json.load(f)
+                settings = _read_json(self.config_file)
+                _conform(settings, _DEFAULT_CONFIG)
+                return settings
             except Exception:
                 defaults = self._default_config()
                 self.settings = defaults
@@ -35,66 +179,40 @@ class Config:
             return defaults
     
     def _default_config(self) -> Dict[str, Any]:
-        """Return default configuration."""
-        return {
-            "llm": {
-                "provider": "ollama",  # ollama, openai, anthropic, google
-                "model": "llama3.2",
-                "api_key": "",
-                "base_url": "http://localhost:11434"
-            },
-            "audio": {
-                "wake_word_enabled": True,
-                "wake_word": "hey agent",
-                "hotkey": "ctrl+space",
-                "stt_model": "base",  # tiny, base, small, medium, large
-                "tts_voice": "en-US-AriaNeural"
-            },
-            "vision": {
-                "primary_method": "accessibility",  # accessibility, vision, hybrid
-                "fallback_to_vision": True
-            },
-            "ui": {
-                "theme": "dark",
-                "position": "top-right",
-                "opacity": 0.95
-            },
-            "safety": {
-                "confirm_dangerous_actions": True,
-                "dangerous_confirmation_count": 3,
-                "blacklist_commands": [
-                    "format",
-                    "rm -rf /",
-                    "del /f /s /q C:\\",
-                    "Format-Volume"
-                ]
-            },
-            "memory": {
-                "enabled": True,
-                "max_history": 1000
-            },
-            "scheduler": {
-                "enabled": True
-            }
-        }
+        """Return a fresh, mutable copy of the default configuration."""
+        return copy.deepcopy(_DEFAULT_CONFIG)
     
     def save(self):
-        """Save current configuration to file."""
-        with open(self.config_file, 'w') as f:
-            json.dump(self.settings, f, indent=2)
+        """Save current configuration to file immediately."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            data = _dump_json(self.settings)
+            
+            # Setting a value to what it already was leaves the file untouched
+            digest = self._digest(data)
+            if digest == self._saved_digest:
+                return
+            
+            # Write then rename so a crash never leaves a truncated file
+            temp_file = self.config_file.with_suffix(".json.tmp")
+            temp_file.write_bytes(data)
+            os.replace(temp_file, self.config_file)
+            self._saved_digest = digest
+    
+    def _schedule_save(self):
+        """Save after SAVE_DELAY_SECONDS, coalescing further changes."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                return
+            # Non-daemon so a pending write still lands at interpreter exit
+            self._save_timer = threading.Timer(SAVE_DELAY_SECONDS, self.save)
+            self._save_timer.start()
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get a configuration value using dot notation."""
-        keys = key.split('.')
-        value = self.settings
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        
-        return value
+        return self._flat.get(key, default)
     
     def set(self, key: str, value: Any):
         """Set a configuration value using dot notation."""
@@ -107,7 +225,9 @@ class Config:
             config = config[k]
         
         config[keys[-1]] = value
-        self.save()
+        # Writes are rare; rebuilding keeps replaced sections consistent
+        self._flat = self._flatten(self.settings)
+        self._schedule_save()
 
 
 # Global configuration instance
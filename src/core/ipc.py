@@ -0,0 +1,132 @@
+"""
+IPC channels between the AI backend and GUI processes.
+
+Messages cross the process boundary as compact JSON bytes over a one-way
+pipe instead of pickled dicts on a multiprocessing.Queue: one orjson encode
+and decode per message, no feeder thread, and nothing is ever unpickled
+from the other side.
+"""
+import json
+import multiprocessing as mp
+import queue
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    def pack(message: Dict[str, Any]) -> bytes:
+        """Encode a message for the wire."""
+        # Plugin and executor results may carry arbitrary objects
+        return orjson.dumps(message, default=str)
+
+    unpack = orjson.loads
+else:
+    def pack(message: Dict[str, Any]) -> bytes:
+        """Encode a message for the wire."""
+        return json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+
+    unpack = json.loads
+
+
+class PackedMessage(dict):
+    """
+    Constant message whose wire bytes are computed once.
+
+    Channels send the cached bytes instead of re-encoding the dict, which
+    suits fixed replies like health checks. Treat instances as read-only.
+    """
+
+    __slots__ = ("packed",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.packed = pack(self)
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    """Return a message's wire bytes, reusing precomputed ones."""
+    if type(message) is PackedMessage:
+        return message.packed
+    return pack(message)
+
+
+def _encode_batch(messages: List[Dict[str, Any]]) -> bytes:
+    """Encode a batch as a JSON array, splicing in precomputed bytes."""
+    return b"[" + b",".join(map(_encode, messages)) + b"]"
+
+
+class Channel:
+    """
+    One-way message channel backed by a multiprocessing Pipe.
+
+    Exposes the put/get/empty subset of the Queue API used by the GUI and
+    backend, so either end can be handed to a child process like a Queue.
+    A channel has a single reader; writers may be several threads or
+    processes and are serialized by a lock. Messages are dicts (or None as
+    a wakeup sentinel), so a frame holding a list is a batch from put_many().
+    """
+
+    def __init__(self):
+        """Create the pipe and its writer lock."""
+        self._reader, self._writer = mp.Pipe(duplex=False)
+        self._write_lock = mp.Lock()
+        # Reader side: messages unpacked from a batch but not yet returned
+        self._pending = deque()
+
+    def put(self, message: Dict[str, Any]):
+        """Send a message; blocks only if the pipe buffer is full."""
+        data = _encode(message)
+        with self._write_lock:
+            self._writer.send_bytes(data)
+
+    def put_many(self, messages: List[Dict[str, Any]]):
+        """Send several messages as one frame; the reader gets them in order."""
+        if len(messages) == 1:
+            self.put(messages[0])
+        elif messages:
+            data = _encode_batch(messages)
+            with self._write_lock:
+                self._writer.send_bytes(data)
+
+    def get(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Receive the next message.
+
+        Args:
+            timeout: Seconds to wait, or None to block indefinitely
+
+        Raises:
+            queue.Empty: If no message arrived within the timeout
+        """
+        if self._pending:
+            return self._pending.popleft()
+        if timeout is not None and not self._reader.poll(timeout):
+            raise queue.Empty
+
+        message = unpack(self._reader.recv_bytes())
+        if isinstance(message, list):
+            self._pending.extend(message[1:])
+            return message[0]
+        return message
+
+    def get_nowait(self) -> Dict[str, Any]:
+        """Receive a waiting message or raise queue.Empty."""
+        return self.get(timeout=0)
+
+    def fileno(self) -> int:
+        """
+        Return the reader's OS handle, for event loops that wait on readiness.
+        
+        On Windows this is a pipe handle, not a socket, so socket-only
+        readiness APIs cannot watch it there.
+        """
+        return self._reader.fileno()
+
+    def empty(self) -> bool:
+        """Return True if no message is waiting."""
+        return not self._pending and not self._reader.poll()
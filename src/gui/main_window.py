@@ -3,52 +3,100 @@ Main GUI Window - Floating overlay widget.
 """
 import sys
 import logging
-from multiprocessing import Queue
+import queue
 from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QLabel, QVBoxLayout, QPushButton
-from PyQt6.QtCore import Qt, QTimer, QPoint, pyqtSignal, QThread
-from PyQt6.QtGui import QPainter, QColor, QPen, QFont
+from PyQt6.QtCore import Qt, QTimer, QPoint, pyqtSignal, QThread, QSocketNotifier
+from PyQt6.QtGui import QPainter, QPainterPath, QBrush, QColor, QPen, QFont
+from src.core.ipc import Channel
 
 logger = logging.getLogger("GUI")
 
+# State indicator stylesheets, built once; Qt re-parses a stylesheet on every set
+_STATE_COLORS = {
+    "idle": "#00ff88",
+    "listening": "#ffaa00",
+    "thinking": "#00aaff",
+    "speaking": "#ff00aa"
+}
+_STATE_STYLESHEETS = {
+    state: f"""
+            QLabel {{
+                color: {color};
+                font-size: 48px;
+            }}
+        """
+    for state, color in _STATE_COLORS.items()
+}
+
 
 class CommandProcessor(QThread):
-    """Thread to process responses from AI backend."""
-    response_received = pyqtSignal(dict)
+    """
+    Thread to process responses from AI backend.
     
-    def __init__(self, response_queue: Queue):
+    Only used on Windows, where the response pipe can't be watched by the
+    GUI event loop directly.
+    """
+    # Every response that was waiting at one wake-up, delivered in one slot call
+    response_received = pyqtSignal(list)
+    
+    def __init__(self, response_queue: Channel):
         super().__init__()
         self.response_queue = response_queue
         self.running = True
     
     def run(self):
-        """Check for responses from AI backend."""
+        """Forward responses from the AI backend as they arrive."""
         while self.running:
-            if not self.response_queue.empty():
-                response = self.response_queue.get()
-                self.response_received.emit(response)
+            # Sleep in the pipe until a response arrives; the timeout only
+            # bounds how long a cleared running flag goes unnoticed
+            try:
+                responses = [self.response_queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            
+            # Drain a burst so it crosses into the GUI thread as one event
+            while True:
+                try:
+                    responses.append(self.response_queue.get_nowait())
+                except queue.Empty:
+                    break
             
-            self.msleep(100)  # Check every 100ms
+            # None is the shutdown sentinel from stop()
+            stopping = None in responses
+            if stopping:
+                responses = responses[:responses.index(None)]
+            if responses:
+                self.response_received.emit(responses)
+            if stopping:
+                break
     
     def stop(self):
-        """Stop the thread."""
+        """Stop the thread, waking it if it is waiting for a response."""
         self.running = False
+        self.response_queue.put(None)
 
 
 class FloatingWidget(QMainWindow):
     """Main floating overlay window."""
     
-    def __init__(self, command_queue: Queue, response_queue: Queue):
+    def __init__(self, command_queue: Channel, response_queue: Channel, shutdown_event=None):
         super().__init__()
         self.command_queue = command_queue
         self.response_queue = response_queue
+        self.shutdown_event = shutdown_event
         
         self.state = "idle"  # idle, listening, thinking, speaking
         self.status_text = "Ready"
         self.is_recording = False
+        self.hotkey_handler = None
+        self.drag_position = None  # Cursor offset from the window corner while dragging
         
         self._init_ui()
         self._start_response_processor()
-        self._setup_hotkey()
+        # Registering the global hotkey can block briefly; let the window
+        # show and paint first, then do it on the first event-loop pass
+        QTimer.singleShot(0, self._setup_hotkey)
+        self._watch_shutdown()
         
         # Test the connection
         self._test_backend()
@@ -69,6 +117,12 @@ class FloatingWidget(QMainWindow):
         self.setFixedSize(300, 200)
         self._position_window()
         
+        # Background painting objects; the size is fixed, so so is the outline
+        self._bg_brush = QBrush(QColor(20, 20, 30, 240))
+        self._border_pen = QPen(QColor(0, 255, 136), 2)
+        self._bg_path = QPainterPath()
+        self._bg_path.addRoundedRect(0, 0, self.width(), self.height(), 20, 20)
+        
         # Central widget
         central = QWidget()
         self.setCentralWidget(central)
@@ -103,12 +157,7 @@ class FloatingWidget(QMainWindow):
         # State indicator
         self.state_label = QLabel("●")
         self.state_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.state_label.setStyleSheet("""
-            QLabel {
-                color: #00ff88;
-                font-size: 48px;
-            }
-        """)
+        self.state_label.setStyleSheet(_STATE_STYLESHEETS[self.state])
         
         layout.addWidget(self.title_label)
         layout.addWidget(self.state_label)
@@ -148,11 +197,15 @@ class FloatingWidget(QMainWindow):
     
     def _position_window(self):
         """Position window in top-right corner."""
-        from PyQt6.QtGui import QScreen
-        screen = QApplication.primaryScreen().geometry()
+        screen = QApplication.primaryScreen()
+        if screen is None:
+            # No display attached (yet); keep Qt's default placement
+            return
         
-        x = screen.width() - self.width() - 50
-        y = 50
+        # The available area excludes the taskbar and may not start at (0, 0)
+        area = screen.availableGeometry()
+        x = area.x() + area.width() - self.width() - 50
+        y = area.y() + 50
         
         self.move(x, y)
     
@@ -162,15 +215,53 @@ class FloatingWidget(QMainWindow):
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # Background
-        painter.setBrush(QColor(20, 20, 30, 240))
-        painter.setPen(QPen(QColor(0, 255, 136), 2))
-        painter.drawRoundedRect(0, 0, self.width(), self.height(), 20, 20)
+        painter.setBrush(self._bg_brush)
+        painter.setPen(self._border_pen)
+        painter.drawPath(self._bg_path)
+    
+    def _watch_shutdown(self):
+        """Close the window once the application asks all processes to stop."""
+        if self.shutdown_event is None:
+            return
+        self.shutdown_timer = QTimer(self)
+        self.shutdown_timer.timeout.connect(self._check_shutdown)
+        self.shutdown_timer.start(250)
+    
+    def _check_shutdown(self):
+        """Close cleanly, running closeEvent, when shutdown was requested."""
+        if self.shutdown_event.is_set():
+            self.shutdown_timer.stop()
+            self.close()
     
     def _start_response_processor(self):
-        """Start thread to process AI backend responses."""
-        self.processor = CommandProcessor(self.response_queue)
-        self.processor.response_received.connect(self._handle_response)
-        self.processor.start()
+        """Deliver AI backend responses to the GUI thread as they arrive."""
+        self.processor = None
+        self.response_notifier = None
+        
+        if sys.platform == "win32":
+            # QSocketNotifier only watches sockets on Windows, not pipe handles
+            self.processor = CommandProcessor(self.response_queue)
+            self.processor.response_received.connect(self._handle_responses)
+            self.processor.start()
+            return
+        
+        # The event loop wakes when the pipe becomes readable; no extra thread
+        self.response_notifier = QSocketNotifier(
+            self.response_queue.fileno(), QSocketNotifier.Type.Read, self
+        )
+        self.response_notifier.activated.connect(self._drain_responses)
+    
+    def _drain_responses(self):
+        """Handle every response waiting on the pipe."""
+        responses = []
+        while True:
+            try:
+                response = self.response_queue.get_nowait()
+            except queue.Empty:
+                break
+            if response is not None:
+                responses.append(response)
+        self._handle_responses(responses)
     
     def _test_backend(self):
         """Test connection to AI backend."""
@@ -192,7 +283,7 @@ class FloatingWidget(QMainWindow):
             logger.info("Hotkey activated: Ctrl+Space")
             
         except Exception as e:
-            logger.error(f"Failed to setup hotkey: {e}")
+            logger.error("Failed to setup hotkey: %s", e)
             self.hotkey_handler = None
     
     def _toggle_recording(self):
@@ -228,6 +319,11 @@ class FloatingWidget(QMainWindow):
             "type": "stop_recording"
         })
     
+    def _handle_responses(self, responses: list):
+        """Handle a burst of responses from AI backend, in order."""
+        for response in responses:
+            self._handle_response(response)
+    
     def _handle_response(self, response: dict):
         """Handle responses from AI backend."""
         response_type = response.get("type", "response")
@@ -238,9 +334,17 @@ class FloatingWidget(QMainWindow):
                 self._start_recording()
             return
 
+        if response_type == "event" and response.get("event") == "partial_transcript":
+            self.set_status(f"… {response.get('message', '')}")
+            return
+
         status = response.get("status", "unknown")
         message = response.get("message", "")
         
+        # Acknowledgement of slow work; its result arrives as a later response
+        if status == "accepted":
+            return
+        
         if status == "success":
             self.set_status(f"✓ {message}")
             
@@ -269,37 +373,30 @@ class FloatingWidget(QMainWindow):
     
     def set_state(self, state: str):
         """Set the current state."""
+        if state == self.state:
+            return
         self.state = state
-        
-        colors = {
-            "idle": "#00ff88",
-            "listening": "#ffaa00",
-            "thinking": "#00aaff",
-            "speaking": "#ff00aa"
-        }
-        
-        color = colors.get(state, "#00ff88")
-        self.state_label.setStyleSheet(f"""
-            QLabel {{
-                color: {color};
-                font-size: 48px;
-            }}
-        """)
+        self.state_label.setStyleSheet(_STATE_STYLESHEETS.get(state, _STATE_STYLESHEETS["idle"]))
     
     def set_status(self, text: str):
         """Update status text."""
+        if text == self.status_text:
+            return
         self.status_text = text
         self.status_label.setText(text)
     
     def mousePressEvent(self, event):
         """Handle mouse press for dragging."""
         if event.button() == Qt.MouseButton.LeftButton:
-            self.drag_position = event.globalPosition().toPoint() - self.frameGeometry().topLeft()
+            cursor = event.globalPosition().toPoint()
+            self.drag_position = cursor - self.frameGeometry().topLeft()
     
     def mouseMoveEvent(self, event):
         """Handle mouse move for dragging."""
-        if event.buttons() == Qt.MouseButton.LeftButton:
-            self.move(event.globalPosition().toPoint() - self.drag_position)
+        if self.drag_position is None or event.buttons() != Qt.MouseButton.LeftButton:
+            return
+        cursor = event.globalPosition().toPoint()
+        self.move(cursor - self.drag_position)
     
     def dragEnterEvent(self, event):
         """Handle drag enter event."""
@@ -322,7 +419,7 @@ class FloatingWidget(QMainWindow):
                 files.append(file_path)
         
         if files:
-            logger.info(f"Files dropped: {files}")
+            logger.info("Files dropped: %s", files)
             
             # Create a command describing the dropped files
             file_list = "\n".join(files)
@@ -343,19 +440,22 @@ class FloatingWidget(QMainWindow):
     
     def closeEvent(self, event):
         """Handle window close."""
-        if hasattr(self, 'hotkey_handler') and self.hotkey_handler:
+        if self.hotkey_handler:
             self.hotkey_handler.stop()
         
-        self.processor.stop()
-        self.processor.wait()
+        if self.processor:
+            self.processor.stop()
+            self.processor.wait()
+        if self.response_notifier:
+            self.response_notifier.setEnabled(False)
         event.accept()
 
 
-def run_gui(command_queue: Queue, response_queue: Queue):
+def run_gui(command_queue: Channel, response_queue: Channel, shutdown_event=None):
     """Run the GUI application."""
     app = QApplication(sys.argv)
     
-    window = FloatingWidget(command_queue, response_queue)
+    window = FloatingWidget(command_queue, response_queue, shutdown_event)
     window.show()
     
     sys.exit(app.exec())
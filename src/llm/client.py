@@ -1,82 +1,250 @@
 """
 LLM Client - Unified interface for multiple LLM providers.
-Supports OpenAI, Anthropic, Google, and Ollama via LiteLLM.
+Supports OpenAI, Anthropic, Google, and Ollama via LiteLLM, and local
+quantized GGUF models via llama-cpp-python.
 """
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, List, Dict, Any, Optional
 from src.core.config import config
 
 logger = logging.getLogger("LLM")
 
+# How long a fetched Ollama model list is reused before asking the server again
+MODEL_LIST_TTL_SECONDS = 30.0
+
+# Pooled HTTP session, so model list queries reuse the keep-alive connection
+_session = None
+
+# Tags URL -> (monotonic fetch time, model names)
+_model_cache: Dict[str, tuple] = {}
+
+# Persistent HTTP pool for LiteLLM completions; back-to-back planning
+# calls reuse a warm connection instead of reconnecting each time
+HTTP_KEEPALIVE_CONNECTIONS = 4
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 60.0
+HTTP_TIMEOUT_SECONDS = 60.0
+
+# Hosted provider -> (display name, LiteLLM attribute holding its API key)
+_HOSTED_PROVIDERS = {
+    "openai": ("OpenAI", "openai_key"),
+    "anthropic": ("Anthropic", "anthropic_key"),
+    "google": ("Google", "gemini_key"),
+}
+
+# Provider -> (LiteLLM model name template, default model)
+_MODEL_NAME_FORMATS = {
+    "ollama": ("ollama/{}", "llama3.2"),
+    "openai": ("{}", "gpt-4o"),
+    "anthropic": ("{}", "claude-3-5-sonnet-20241022"),
+    "google": ("gemini/{}", "gemini-1.5-pro"),
+}
+
+
+def _http_session():
+    """Return the shared requests session, creating it on first use."""
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
 
 class LLMClient:
-    """Unified LLM client using LiteLLM."""
+    """
+    Unified LLM client using LiteLLM.
+    
+    The provider (litellm or a llama.cpp model) is set up on first use, so
+    importing this module stays cheap.
+    """
     
     def __init__(self):
-        """Initialize LLM client."""
+        """Initialize LLM client settings."""
         self.provider = config.get("llm.provider", "ollama")
         self.model = config.get("llm.model", "llama3.2")
         self.api_key = config.get("llm.api_key", "")
         self.base_url = config.get("llm.base_url", "http://localhost:11434")
+        self.keep_alive = config.get("llm.keep_alive", "30m")
+        self.model_path = config.get("llm.model_path", "")
         self.active_model = self.model
         self.last_error = ""
-        
-        self._init_client()
+        self.model_name = self.model
+        self.litellm = None
+        self.llama = None
+        self._initialized = False
+        self._init_lock = threading.Lock()
+    
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _compose_model_name(provider: str, model: str) -> str:
+        """Return the LiteLLM model name for a provider; unknown ones go to Ollama."""
+        template, default = _MODEL_NAME_FORMATS.get(provider, _MODEL_NAME_FORMATS["ollama"])
+        return template.format(model or default)
+
+    def _ensure_initialized(self):
+        """Set up the provider client once, on first use."""
+        if self._initialized:
+            return
+        with self._init_lock:
+            if not self._initialized:
+                self._init_client()
+                self._initialized = True
     
     def _init_client(self):
         """Initialize the LLM client."""
+        if self.provider == "llamacpp":
+            self._init_llamacpp()
+            return
+
         try:
             import litellm
             self.litellm = litellm
+            self._configure_http_pool()
             
-            # Configure based on provider
-            if self.provider == "ollama":
-                self.active_model = self._resolve_ollama_model()
-                self.model_name = f"ollama/{self.active_model}"
-                self.litellm.api_base = self.base_url
-                logger.info(f"LLM initialized: Ollama ({self.active_model}) at {self.base_url}")
-                
-            elif self.provider == "openai":
-                self.model_name = self.model or "gpt-4o"
-                if self.api_key:
-                    self.litellm.openai_key = self.api_key
-                logger.info(f"LLM initialized: OpenAI ({self.model_name})")
-                
-            elif self.provider == "anthropic":
-                self.model_name = self.model or "claude-3-5-sonnet-20241022"
-                if self.api_key:
-                    self.litellm.anthropic_key = self.api_key
-                logger.info(f"LLM initialized: Anthropic ({self.model_name})")
-                
-            elif self.provider == "google":
-                self.model_name = f"gemini/{self.model or 'gemini-1.5-pro'}"
-                if self.api_key:
-                    self.litellm.gemini_key = self.api_key
-                logger.info(f"LLM initialized: Google ({self.model_name})")
-            
-            else:
-                logger.warning(f"Unknown provider: {self.provider}, defaulting to Ollama")
-                self.model_name = f"ollama/{self.model}"
+            setup = self._PROVIDER_SETUP.get(self.provider, LLMClient._setup_unknown)
+            description = setup(self)
+            if description:
+                logger.info("LLM initialized: %s", description)
                 
         except ImportError:
             logger.error("litellm not installed. Install with: pip install litellm")
             self.litellm = None
 
-    def _get_ollama_models(self) -> List[str]:
-        """Get locally available Ollama model names."""
+    def _setup_ollama(self) -> str:
+        """Point LiteLLM at the local Ollama server and pick an installed model."""
+        self.active_model = self._resolve_ollama_model()
+        self.model_name = self._compose_model_name(self.provider, self.active_model)
+        self.litellm.api_base = self.base_url
+        return f"Ollama ({self.active_model}) at {self.base_url}"
+
+    def _setup_hosted(self) -> str:
+        """Configure a hosted provider that authenticates with an API key."""
+        label, key_attribute = _HOSTED_PROVIDERS[self.provider]
+        self.model_name = self._compose_model_name(self.provider, self.model)
+        if self.api_key:
+            setattr(self.litellm, key_attribute, self.api_key)
+        return f"{label} ({self.model_name})"
+
+    def _setup_unknown(self) -> Optional[str]:
+        """Fall back to Ollama naming for an unrecognized provider."""
+        logger.warning("Unknown provider: %s, defaulting to Ollama", self.provider)
+        self.model_name = self._compose_model_name(self.provider, self.model)
+        return None
+
+    # Provider -> setup method; each sets model_name and returns a log description
+    _PROVIDER_SETUP = {
+        "ollama": _setup_ollama,
+        "openai": _setup_hosted,
+        "anthropic": _setup_hosted,
+        "google": _setup_hosted,
+    }
+
+    def _configure_http_pool(self):
+        """Give LiteLLM a shared keep-alive HTTP client unless one is set already."""
+        if getattr(self.litellm, "client_session", None) is not None:
+            return
         try:
-            import requests
+            import httpx
+        except ImportError:
+            return
 
-            url = f"{self.base_url.rstrip('/')}/api/tags"
-            response = requests.get(url, timeout=3)
+        self.litellm.client_session = httpx.Client(
+            limits=httpx.Limits(
+                max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS),
+        )
+
+    def _init_llamacpp(self):
+        """Load a local GGUF model (e.g. a Q4_K_M quant) with llama-cpp-python."""
+        self.model_name = os.path.basename(self.model_path) or self.model
+
+        if not self.model_path or not os.path.isfile(self.model_path):
+            self.last_error = f"GGUF model not found at '{self.model_path}'"
+            logger.error(self.last_error)
+            return
+
+        try:
+            from llama_cpp import Llama, LlamaRAMCache
+        except ImportError:
+            logger.error("llama-cpp-python not installed. Install with: pip install llama-cpp-python")
+            return
+
+        try:
+            self.llama = Llama(
+                model_path=self.model_path,
+                n_gpu_layers=config.get("llm.n_gpu_layers", -1),
+                n_ctx=config.get("llm.n_ctx", 2048),
+                n_batch=512,
+                use_mmap=True,
+                verbose=False,
+            )
+            # Reuse the evaluated system prompt across planner calls
+            self.llama.set_cache(LlamaRAMCache())
+            logger.info("LLM initialized: llama.cpp (%s)", self.model_name)
+        except Exception as e:
+            self.last_error = f"Failed to load GGUF model: {e}"
+            logger.error(self.last_error)
+            self.llama = None
+
+    def _chat_llamacpp(
+        self,
+        messages: List[Dict[str, str]],
+        on_token: Optional[Callable[[str], None]] = None,
+        **kwargs
+    ) -> str:
+        """Run a chat completion against the local llama.cpp model."""
+        if not self.llama:
+            return f"Error: {self.last_error or 'llama.cpp model not loaded'}"
+
+        try:
+            logger.info("Sending chat request to llama.cpp (%s)", self.model_name)
+            if on_token:
+                parts = []
+                for chunk in self.llama.create_chat_completion(messages=messages, stream=True, **kwargs):
+                    token = chunk["choices"][0]["delta"].get("content")
+                    if token:
+                        parts.append(token)
+                        on_token(token)
+                content = "".join(parts)
+            else:
+                response = self.llama.create_chat_completion(messages=messages, **kwargs)
+                content = response["choices"][0]["message"]["content"]
+            logger.info("Received response: %s...", content[:100])
+            self.last_error = ""
+            return content
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error("Error in llama.cpp completion: %s", e)
+            return f"Error: {e}"
+
+    def _tags_url(self) -> str:
+        """Return the Ollama endpoint that lists installed models."""
+        return f"{self.base_url.rstrip('/')}/api/tags"
+
+    def _get_ollama_models(self) -> List[str]:
+        """Get locally available Ollama model names, cached for a short while."""
+        url = self._tags_url()
+        cached = _model_cache.get(url)
+        if cached and time.monotonic() - cached[0] < MODEL_LIST_TTL_SECONDS:
+            return cached[1]
+
+        try:
+            response = _http_session().get(url, timeout=3)
             response.raise_for_status()
 
             data = response.json()
             models = data.get("models", [])
             names = [model.get("name", "") for model in models if model.get("name")]
-            return list(dict.fromkeys(names))
+            names = list(dict.fromkeys(names))
+            _model_cache[url] = (time.monotonic(), names)
+            return names
         except Exception as e:
-            logger.warning(f"Could not query Ollama model list: {e}")
+            logger.warning("Could not query Ollama model list: %s", e)
             return []
 
     def _resolve_ollama_model(self) -> str:
@@ -84,79 +252,120 @@ class LLMClient:
         available = self._get_ollama_models()
         preferred = self.model
 
-        if preferred in available:
+        available_set = set(available)
+        if preferred in available_set:
             return preferred
 
-        preferred_base = preferred.split(":")[0]
+        # Base name -> installed tag variants, in server order
+        by_base: Dict[str, List[str]] = {}
+        for name in available:
+            by_base.setdefault(name.split(":", 1)[0], []).append(name)
 
-        # If user configured base model without tag, prefer any installed tag variant.
-        if ":" not in preferred:
-            tagged_matches = [name for name in available if name.split(":")[0] == preferred]
-            if tagged_matches:
+        preferred_base = preferred.split(":", 1)[0]
+        base_matches = by_base.get(preferred_base)
+        if base_matches:
+            if ":" not in preferred:
+                # User configured base model without tag; use any installed tag variant
                 logger.warning(
-                    f"Configured Ollama model '{preferred}' not found exactly. Using installed variant '{tagged_matches[0]}'."
+                    "Configured Ollama model '%s' not found exactly. Using installed variant '%s'.",
+                    preferred, base_matches[0]
+                )
+            else:
+                # User configured a tag that is missing; pick another tag of the same base
+                logger.warning(
+                    "Configured Ollama model '%s' not found. Falling back to installed variant '%s'.",
+                    preferred, base_matches[0]
                 )
-                return tagged_matches[0]
-
-        # If user configured model with tag and base exists with other tags, pick closest base variant.
-        base_matches = [name for name in available if name.split(":")[0] == preferred_base]
-        if base_matches:
-            logger.warning(
-                f"Configured Ollama model '{preferred}' not found. Falling back to installed variant '{base_matches[0]}'."
-            )
             return base_matches[0]
 
         fallback_order = ["llama3.2", "llama3.1", "qwen2.5", "phi3", "mistral", "llama3"]
         for candidate in fallback_order:
-            exact_match = next((name for name in available if name == candidate), None)
-            if exact_match:
-                logger.warning(
-                    f"Configured Ollama model '{preferred}' not found. Falling back to '{exact_match}'."
-                )
-                return exact_match
-
-            tagged_match = next((name for name in available if name.split(":")[0] == candidate), None)
-            if tagged_match:
-                logger.warning(
-                    f"Configured Ollama model '{preferred}' not found. Falling back to '{tagged_match}'."
-                )
-                return tagged_match
+            if candidate in available_set:
+                match = candidate
+            elif candidate in by_base:
+                match = by_base[candidate][0]
+            else:
+                continue
+            logger.warning(
+                "Configured Ollama model '%s' not found. Falling back to '%s'.", preferred, match
+            )
+            return match
 
         if available:
             logger.warning(
-                f"Configured Ollama model '{preferred}' not found. Falling back to first available model '{available[0]}'."
+                "Configured Ollama model '%s' not found. Falling back to first available model '%s'.",
+                preferred, available[0]
             )
             return available[0]
 
         return preferred
     
-    def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
+    def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        on_token: Optional[Callable[[str], None]],
+        **kwargs
+    ) -> str:
+        """Run one LiteLLM completion, streaming tokens to on_token if given."""
+        if not on_token:
+            response = self.litellm.completion(
+                model=self.model_name,
+                messages=messages,
+                **kwargs
+            )
+            return response.choices[0].message.content
+
+        parts = []
+        for chunk in self.litellm.completion(
+            model=self.model_name,
+            messages=messages,
+            stream=True,
+            **kwargs
+        ):
+            token = chunk.choices[0].delta.content
+            if token:
+                parts.append(token)
+                on_token(token)
+        return "".join(parts)
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        on_token: Optional[Callable[[str], None]] = None,
+        **kwargs
+    ) -> str:
         """
         Send a chat completion request.
         
         Args:
             messages: List of message dicts with 'role' and 'content'
+            on_token: Optional callback; streams the reply and is called with
+                each piece of text as it is generated
             **kwargs: Additional parameters for the API
             
         Returns:
             Response text from the model
         """
+        self._ensure_initialized()
+        if self.provider == "llamacpp":
+            return self._chat_llamacpp(messages, on_token, **kwargs)
+
         if not self.litellm:
             logger.error("LiteLLM not available")
             self.last_error = "LiteLLM not available"
             return ""
         
+        # 0 is meaningful (unload right away); only an empty setting is skipped
+        if self.provider == "ollama" and self.keep_alive not in (None, ""):
+            # Keeping the model resident lets Ollama reuse the KV cache of the
+            # unchanged system prompt instead of re-running its prefill
+            kwargs.setdefault("keep_alive", self.keep_alive)
+
         try:
-            logger.info(f"Sending chat request to {self.provider}")
-            
-            response = self.litellm.completion(
-                model=self.model_name,
-                messages=messages,
-                **kwargs
-            )
+            logger.info("Sending chat request to %s", self.provider)
             
-            content = response.choices[0].message.content
-            logger.info(f"Received response: {content[:100]}...")
+            content = self._complete(messages, on_token, **kwargs)
+            logger.info("Received response: %s...", content[:100])
             
             return content
             
@@ -164,26 +373,23 @@ class LLMClient:
             error_text = str(e)
 
             if self.provider == "ollama" and "not found" in error_text.lower():
+                # The installed models changed since the list was cached
+                _model_cache.pop(self._tags_url(), None)
                 fallback_model = self._resolve_ollama_model()
                 if fallback_model and fallback_model != self.active_model:
-                    logger.warning(f"Retrying with fallback Ollama model: {fallback_model}")
+                    logger.warning("Retrying with fallback Ollama model: %s", fallback_model)
                     self.active_model = fallback_model
-                    self.model_name = f"ollama/{fallback_model}"
+                    self.model_name = self._compose_model_name(self.provider, fallback_model)
                     try:
-                        response = self.litellm.completion(
-                            model=self.model_name,
-                            messages=messages,
-                            **kwargs
-                        )
-                        content = response.choices[0].message.content
-                        logger.info(f"Received response with fallback model: {content[:100]}...")
+                        content = self._complete(messages, on_token, **kwargs)
+                        logger.info("Received response with fallback model: %s...", content[:100])
                         self.last_error = ""
                         return content
                     except Exception as retry_error:
                         error_text = str(retry_error)
 
             self.last_error = error_text
-            logger.error(f"Error in chat completion: {error_text}")
+            logger.error("Error in chat completion: %s", error_text)
 
             if self.provider == "ollama" and "not found" in error_text.lower():
                 return (
@@ -220,7 +426,10 @@ class LLMClient:
         return self.chat(messages)
     
     def is_available(self) -> bool:
-        """Check if LLM client is available."""
+        """Check if LLM client is available, setting it up if needed."""
+        self._ensure_initialized()
+        if self.provider == "llamacpp":
+            return self.llama is not None
         return self.litellm is not None
 
 
@@ -1,13 +1,20 @@
 """
 Planning Module - Converts user commands into actionable plans.
 """
+import copy
+import hashlib
 import json
 import logging
-from typing import Dict, Any, List
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
 from src.llm.client import llm_client
 
 logger = logging.getLogger("Planner")
 
+# Plans kept for exact repeats of the same command and context on the same model
+PLAN_CACHE_SIZE = 64
+
 
 SYSTEM_PROMPT = """You are openNova, an AI assistant that controls a Windows computer. Your job is to convert user commands into actionable plans.
 
@@ -63,6 +70,7 @@ IMPORTANT:
 - Keep plans simple and direct
 - For dangerous operations (delete, format, etc), add a "confirm": true flag
 - For macro recording, use target as macro name (e.g., "excel_invoice_flow")
+- For several dependent shell commands, use one shell action whose target is a list of commands; they run in order and stop at the first failure (add "shell": "cmd" for CMD commands)
 """
 
 
@@ -73,7 +81,37 @@ class ActionPlanner:
         """Initialize the planner."""
         self.llm = llm_client
         self.last_error = ""
-    
+        self._plan_cache: "OrderedDict[bytes, List[Dict[str, Any]]]" = OrderedDict()
+        self._plan_cache_lock = threading.Lock()
+
+    def _cache_key(self, user_command: str, context: Optional[Dict[str, Any]]) -> bytes:
+        """Hash a command, its context and the active model into a plan cache key."""
+        # Case is kept: plans type and search for the command's exact text.
+        # The model is part of the key, so switching (or falling back to
+        # another) model never serves plans that a different model produced.
+        payload = "\0".join((self.llm.provider, self.llm.model_name, user_command.strip()))
+        if context:
+            payload += "\0" + json.dumps(context, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+    def _cached_plan(self, key: bytes) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of a cached plan, or None."""
+        with self._plan_cache_lock:
+            plan = self._plan_cache.get(key)
+            if plan is None:
+                return None
+            self._plan_cache.move_to_end(key)
+        # The executor may annotate steps, so never hand out the cached objects
+        return copy.deepcopy(plan)
+
+    def _store_plan(self, key: bytes, plan: List[Dict[str, Any]]):
+        """Cache a freshly generated plan, evicting the oldest entry."""
+        with self._plan_cache_lock:
+            self._plan_cache[key] = copy.deepcopy(plan)
+            self._plan_cache.move_to_end(key)
+            while len(self._plan_cache) > PLAN_CACHE_SIZE:
+                self._plan_cache.popitem(last=False)
+
     def create_plan(self, user_command: str, context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """
         Create an action plan from a user command.
@@ -87,13 +125,21 @@ class ActionPlanner:
         """
         if not self.llm.is_available():
             logger.error("LLM not available for planning")
-            self.last_error = "LLM not available for planning"
+            self.last_error = self.llm.last_error or "LLM not available for planning"
             return []
         
         try:
             self.last_error = ""
 
-            # Build the prompt
+            key = self._cache_key(user_command, context)
+            cached = self._cached_plan(key)
+            if cached is not None:
+                logger.info("Reusing cached plan for command: %s", user_command)
+                return cached
+
+            # Build the prompt. SYSTEM_PROMPT stays byte-identical across calls
+            # and everything per-request goes in the user turn, so the server
+            # can reuse the KV cache for the shared prefix.
             prompt = f"User command: {user_command}\n\n"
             
             if context:
@@ -101,7 +147,7 @@ class ActionPlanner:
             
             prompt += "Generate an action plan to fulfill this command:"
             
-            logger.info(f"Planning for command: {user_command}")
+            logger.info("Planning for command: %s", user_command)
             
             # Get response from LLM
             response = self.llm.simple_prompt(
@@ -111,17 +157,19 @@ class ActionPlanner:
 
             if isinstance(response, str) and response.startswith("Error:"):
                 self.last_error = response
-                logger.error(f"Planner LLM error: {response}")
+                logger.error("Planner LLM error: %s", response)
                 return []
             
             # Parse JSON response
             plan = self._parse_plan(response)
+            if plan:
+                self._store_plan(key, plan)
             
-            logger.info(f"Generated plan with {len(plan)} steps")
+            logger.info("Generated plan with %s steps", len(plan))
             return plan
             
         except Exception as e:
-            logger.error(f"Error creating plan: {e}")
+            logger.error("Error creating plan: %s", e)
             self.last_error = str(e)
             return []
     
@@ -152,16 +200,16 @@ class ActionPlanner:
             elif isinstance(data, list):
                 return data
             else:
-                logger.error(f"Unexpected plan format: {type(data)}")
+                logger.error("Unexpected plan format: %s", type(data))
                 return []
                 
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse plan JSON: {e}")
-            logger.debug(f"Response was: {response}")
+            logger.error("Failed to parse plan JSON: %s", e)
+            logger.debug("Response was: %s", response)
             self.last_error = f"Failed to parse plan JSON: {e}"
             return []
         except Exception as e:
-            logger.error(f"Error parsing plan: {e}")
+            logger.error("Error parsing plan: %s", e)
             self.last_error = str(e)
             return []
     
@@ -179,12 +227,12 @@ class ActionPlanner:
         
         for i, action in enumerate(plan):
             if not isinstance(action, dict):
-                logger.error(f"Action {i} is not a dict")
+                logger.error("Action %s is not a dict", i)
                 return False
             
             for field in required_fields:
                 if field not in action:
-                    logger.error(f"Action {i} missing required field: {field}")
+                    logger.error("Action %s missing required field: %s", i, field)
                     return False
         
         return True
@@ -213,7 +261,7 @@ class ActionPlanner:
             action_str = json.dumps(action).lower()
             for keyword in dangerous_keywords:
                 if keyword in action_str:
-                    logger.warning(f"Dangerous keyword detected: {keyword}")
+                    logger.warning("Dangerous keyword detected: %s", keyword)
                     return True
         
         return False
@@ -4,7 +4,7 @@ Memory Manager - Long-term memory using ChromaDB.
 import logging
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 from datetime import datetime
 
 logger = logging.getLogger("Memory")
@@ -43,49 +43,61 @@ class MemoryManager:
                 metadata={"description": "Long-term memory for openNova"}
             )
             
-            logger.info(f"Memory initialized at {self.persist_dir}")
-            logger.info(f"Memory contains {self.collection.count()} entries")
+            logger.info("Memory initialized at %s", self.persist_dir)
+            logger.info("Memory contains %s entries", self.collection.count())
             
         except ImportError:
             logger.error("chromadb not installed. Install with: pip install chromadb")
             self.client = None
         except Exception as e:
-            logger.error(f"Error initializing memory: {e}")
+            logger.error("Error initializing memory: %s", e)
             self.client = None
     
-    def remember(self, content: str, metadata: Dict[str, Any] = None):
+    def remember(self, content: Union[str, List[str]], metadata: Dict[str, Any] = None):
         """
-        Store a memory.
+        Store one memory, or several in a single batch.
         
         Args:
-            content: The content to remember
-            metadata: Additional metadata (type, timestamp, etc.)
+            content: The content to remember, or a list of contents. A list is
+                added in one collection call so its embeddings are computed
+                as a single batch.
+            metadata: Additional metadata (type, timestamp, etc.), applied
+                to every entry
         """
         if not self.collection:
             logger.warning("Memory not available")
             return
         
+        contents = [content] if isinstance(content, str) else list(content)
+        if not contents:
+            return
+        
         try:
             # Add timestamp
             if metadata is None:
                 metadata = {}
             
-            metadata["timestamp"] = datetime.now().isoformat()
+            now = datetime.now()
+            metadata["timestamp"] = now.isoformat()
             
-            # Generate ID
-            memory_id = f"mem_{int(datetime.now().timestamp() * 1000)}"
+            # Generate IDs
+            stamp = int(now.timestamp() * 1000)
+            if len(contents) == 1:
+                ids = [f"mem_{stamp}"]
+            else:
+                ids = [f"mem_{stamp}_{i}" for i in range(len(contents))]
             
             # Add to collection
             self.collection.add(
-                documents=[content],
-                metadatas=[metadata],
-                ids=[memory_id]
+                documents=contents,
+                metadatas=[dict(metadata) for _ in contents],
+                ids=ids
             )
             
-            logger.info(f"Stored memory: {content[:50]}...")
+            logger.info("Stored %s memories: %s...", len(contents), contents[0][:50])
             
         except Exception as e:
-            logger.error(f"Error storing memory: {e}")
+            logger.error("Error storing memory: %s", e)
     
     def recall(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
         """
@@ -118,11 +130,11 @@ class MemoryManager:
                     }
                     memories.append(memory)
             
-            logger.info(f"Recalled {len(memories)} memories for: {query}")
+            logger.info("Recalled %s memories for: %s", len(memories), query)
             return memories
             
         except Exception as e:
-            logger.error(f"Error recalling memory: {e}")
+            logger.error("Error recalling memory: %s", e)
             return []
     
     def remember_preference(self, key: str, value: str):
@@ -170,7 +182,7 @@ class MemoryManager:
                 self.collection = self.client.create_collection("agent_memory")
                 logger.info("All memories cleared")
             except Exception as e:
-                logger.error(f"Error clearing memories: {e}")
+                logger.error("Error clearing memories: %s", e)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get memory statistics."""
@@ -5,7 +5,8 @@ import os
 import sys
 import importlib.util
 import logging
-from typing import Dict, List, Optional, Any
+import re
+from typing import Dict, FrozenSet, List, Optional, Pattern, Set, Any
 from pathlib import Path
 
 from .skill_base import Skill
@@ -27,16 +28,21 @@ class PluginManager:
         """
         self.skills_dir = Path(skills_dir)
         self.skills: Dict[str, Skill] = {}
-        logger.info(f"Plugin manager initialized with skills dir: {self.skills_dir}")
+        
+        # Keyword dispatch index, rebuilt whenever the skill set changes
+        self._keyword_scanner: Optional[Pattern] = None
+        self._keyword_owners: Dict[str, FrozenSet[str]] = {}
+        self._unindexed_skills: Set[str] = set()
+        logger.info("Plugin manager initialized with skills dir: %s", self.skills_dir)
     
     def load_all_skills(self):
         """
         Load all skills from the skills directory.
         """
         if not self.skills_dir.exists():
-            logger.warning(f"Skills directory does not exist: {self.skills_dir}")
+            logger.warning("Skills directory does not exist: %s", self.skills_dir)
             self.skills_dir.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Created skills directory: {self.skills_dir}")
+            logger.info("Created skills directory: %s", self.skills_dir)
             return
         
         # Find all Python files in the skills directory
@@ -53,7 +59,47 @@ class PluginManager:
             try:
                 self._load_skill_from_file(skill_file)
             except Exception as e:
-                logger.error(f"Failed to load skill from {skill_file}: {e}")
+                logger.error("Failed to load skill from %s: %s", skill_file, e)
+        
+        self.build_dispatch_index()
+    
+    def build_dispatch_index(self):
+        """
+        Precompile every skill's keywords into one scanner.
+        
+        Skills that declare keywords are only asked to handle input that
+        contains one of them; skills without keywords are always asked.
+        """
+        owners: Dict[str, Set[str]] = {}
+        self._unindexed_skills = set()
+        for name, skill in self.skills.items():
+            terms = {kw.lower() for kw in skill.keywords if kw}
+            if not terms:
+                self._unindexed_skills.add(name)
+            for term in terms:
+                owners.setdefault(term, set()).add(name)
+        
+        # The scanner reports one keyword per position, so a match also
+        # implies every shorter keyword contained in it
+        self._keyword_owners = {
+            term: frozenset().union(*(names for other, names in owners.items() if other in term))
+            for term in owners
+        }
+        
+        if owners:
+            alternation = "|".join(re.escape(term) for term in sorted(owners, key=len, reverse=True))
+            # Zero-width lookahead lets matches overlap
+            self._keyword_scanner = re.compile(f"(?=({alternation}))", re.IGNORECASE)
+        else:
+            self._keyword_scanner = None
+    
+    def _candidate_skills(self, user_input: str) -> Set[str]:
+        """Return the names of skills worth asking about this input."""
+        candidates = set(self._unindexed_skills)
+        if self._keyword_scanner is not None:
+            for match in self._keyword_scanner.finditer(user_input):
+                candidates.update(self._keyword_owners.get(match.group(1).lower(), ()))
+        return candidates
     
     def _load_skill_from_file(self, file_path: Path):
         """
@@ -67,7 +113,7 @@ class PluginManager:
         # Load the module
         spec = importlib.util.spec_from_file_location(module_name, file_path)
         if spec is None or spec.loader is None:
-            logger.error(f"Could not load spec for {file_path}")
+            logger.error("Could not load spec for %s", file_path)
             return
         
         module = importlib.util.module_from_spec(spec)
@@ -84,7 +130,7 @@ class PluginManager:
                 skill_classes.append(attr)
         
         if not skill_classes:
-            logger.warning(f"No Skill subclasses found in {file_path}")
+            logger.warning("No Skill subclasses found in %s", file_path)
             return
         
         # Instantiate all skill classes found
@@ -93,9 +139,9 @@ class PluginManager:
                 skill_instance = skill_class()
                 skill_instance.on_load()
                 self.skills[skill_instance.name] = skill_instance
-                logger.info(f"Loaded skill: {skill_instance.name} v{skill_instance.version} by {skill_instance.author}")
+                logger.info("Loaded skill: %s v%s by %s", skill_instance.name, skill_instance.version, skill_instance.author)
             except Exception as e:
-                logger.error(f"Failed to instantiate skill {skill_class.__name__}: {e}")
+                logger.error("Failed to instantiate skill %s: %s", skill_class.__name__, e)
     
     def unload_skill(self, skill_name: str):
         """
@@ -108,9 +154,10 @@ class PluginManager:
             skill = self.skills[skill_name]
             skill.on_unload()
             del self.skills[skill_name]
-            logger.info(f"Unloaded skill: {skill_name}")
+            self.build_dispatch_index()
+            logger.info("Unloaded skill: %s", skill_name)
         else:
-            logger.warning(f"Skill not found: {skill_name}")
+            logger.warning("Skill not found: %s", skill_name)
     
     def reload_skill(self, skill_name: str):
         """
@@ -133,8 +180,12 @@ class PluginManager:
         Returns:
             The skill that can handle the input, or None
         """
-        for skill in self.skills.values():
-            if skill.enabled and skill.can_handle(user_input):
+        candidates = self._candidate_skills(user_input)
+        if not candidates:
+            return None
+        
+        for name, skill in self.skills.items():
+            if name in candidates and skill.enabled and skill.can_handle(user_input):
                 return skill
         return None
     
@@ -151,12 +202,12 @@ class PluginManager:
         """
         skill = self.get_skill_for_input(user_input)
         if skill:
-            logger.info(f"Executing skill: {skill.name}")
+            logger.info("Executing skill: %s", skill.name)
             try:
                 result = skill.execute(user_input, context)
                 return result
             except Exception as e:
-                logger.error(f"Error executing skill {skill.name}: {e}")
+                logger.error("Error executing skill %s: %s", skill.name, e)
                 return {
                     "success": False,
                     "response": f"Error executing skill: {str(e)}",
@@ -187,10 +238,10 @@ class PluginManager:
         """Enable a skill."""
         if skill_name in self.skills:
             self.skills[skill_name].enabled = True
-            logger.info(f"Enabled skill: {skill_name}")
+            logger.info("Enabled skill: %s", skill_name)
     
     def disable_skill(self, skill_name: str):
         """Disable a skill."""
         if skill_name in self.skills:
             self.skills[skill_name].enabled = False
-            logger.info(f"Disabled skill: {skill_name}")
+            logger.info("Disabled skill: %s", skill_name)
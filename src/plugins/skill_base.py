@@ -2,18 +2,38 @@
 Base class for all skills/plugins.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Pattern
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
 
+def compile_keywords(keywords: List[str]) -> Optional[Pattern]:
+    """
+    Compile trigger keywords into a single case-insensitive pattern.
+    
+    Args:
+        keywords: Keywords to match anywhere in the input
+        
+    Returns:
+        Compiled pattern, or None if there are no keywords
+    """
+    terms = sorted({kw.lower() for kw in keywords if kw}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+
+
 class Skill(ABC):
     """
     Base class for all skills. Each skill can respond to voice commands
     and execute custom logic.
     """
     
+    # Trigger keywords; matched in a single pass by matches_keywords()
+    keywords: List[str] = []
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialize the skill.
@@ -23,7 +43,8 @@ class Skill(ABC):
         """
         self.config = config or {}
         self.enabled = True
-        logger.info(f"Initialized skill: {self.name}")
+        self._keyword_pattern = compile_keywords(self.keywords)
+        logger.info("Initialized skill: %s", self.name)
     
     @property
     @abstractmethod
@@ -60,6 +81,20 @@ class Skill(ABC):
         """
         pass
     
+    def matches_keywords(self, user_input: str) -> bool:
+        """
+        Check whether the input contains any of this skill's keywords.
+        
+        Args:
+            user_input: The user's voice command (text)
+            
+        Returns:
+            True if at least one keyword occurs in the input
+        """
+        if self._keyword_pattern is None:
+            return False
+        return self._keyword_pattern.search(user_input) is not None
+    
     @abstractmethod
     def execute(self, user_input: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
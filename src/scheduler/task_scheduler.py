@@ -52,10 +52,10 @@ class TaskScheduler:
                 kwargs=kwargs or {},
                 replace_existing=True
             )
-            logger.info(f"Scheduled one-time task '{task_id}' for {run_date}")
+            logger.info("Scheduled one-time task '%s' for %s", task_id, run_date)
             return True
         except Exception as e:
-            logger.error(f"Failed to schedule one-time task '{task_id}': {e}")
+            logger.error("Failed to schedule one-time task '%s': %s", task_id, e)
             return False
     
     def schedule_interval(self,
@@ -105,10 +105,10 @@ class TaskScheduler:
             if seconds:
                 interval_str.append(f"{seconds}s")
             
-            logger.info(f"Scheduled interval task '{task_id}' every {' '.join(interval_str)}")
+            logger.info("Scheduled interval task '%s' every %s", task_id, ' '.join(interval_str))
             return True
         except Exception as e:
-            logger.error(f"Failed to schedule interval task '{task_id}': {e}")
+            logger.error("Failed to schedule interval task '%s': %s", task_id, e)
             return False
     
     def schedule_cron(self,
@@ -155,10 +155,10 @@ class TaskScheduler:
                 replace_existing=True
             )
             
-            logger.info(f"Scheduled cron task '{task_id}'")
+            logger.info("Scheduled cron task '%s'", task_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to schedule cron task '{task_id}': {e}")
+            logger.error("Failed to schedule cron task '%s': %s", task_id, e)
             return False
     
     def cancel_task(self, task_id: str) -> bool:
@@ -173,10 +173,10 @@ class TaskScheduler:
         """
         try:
             self.scheduler.remove_job(task_id)
-            logger.info(f"Cancelled task '{task_id}'")
+            logger.info("Cancelled task '%s'", task_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to cancel task '{task_id}': {e}")
+            logger.error("Failed to cancel task '%s': %s", task_id, e)
             return False
     
     def pause_task(self, task_id: str) -> bool:
@@ -191,10 +191,10 @@ class TaskScheduler:
         """
         try:
             self.scheduler.pause_job(task_id)
-            logger.info(f"Paused task '{task_id}'")
+            logger.info("Paused task '%s'", task_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to pause task '{task_id}': {e}")
+            logger.error("Failed to pause task '%s': %s", task_id, e)
             return False
     
     def resume_task(self, task_id: str) -> bool:
@@ -209,10 +209,10 @@ class TaskScheduler:
         """
         try:
             self.scheduler.resume_job(task_id)
-            logger.info(f"Resumed task '{task_id}'")
+            logger.info("Resumed task '%s'", task_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to resume task '{task_id}': {e}")
+            logger.error("Failed to resume task '%s': %s", task_id, e)
             return False
     
     def get_all_tasks(self) -> List[Dict[str, Any]]:
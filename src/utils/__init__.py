@@ -1,6 +1,7 @@
 """
 Utility modules for openNova.
 """
-from .logging_config import setup_logging, get_logger
+from .logging_config import setup_logging, get_logger, stop_logging
+from .lazy import LazyProxy
 
-__all__ = ["setup_logging", "get_logger"]
+__all__ = ["setup_logging", "get_logger", "stop_logging", "LazyProxy"]
@@ -0,0 +1,174 @@
+"""
+CPU affinity helpers for pinning processes and long-running worker threads.
+"""
+import ctypes
+import logging
+import os
+import sys
+from ctypes import wintypes
+from typing import Iterable, List
+
+logger = logging.getLogger("Affinity")
+
+ABOVE_NORMAL_PRIORITY_CLASS = 0x8000
+
+
+def _load_kernel32():
+    """Load kernel32 with thread affinity prototypes, or None off Windows."""
+    if sys.platform != "win32":
+        return None
+
+    try:
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.GetCurrentThread.restype = ctypes.c_void_p
+        kernel32.SetThreadAffinityMask.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+        kernel32.GetCurrentProcess.restype = ctypes.c_void_p
+        kernel32.GetProcessAffinityMask.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_size_t), ctypes.POINTER(ctypes.c_size_t)
+        ]
+        kernel32.GetProcessAffinityMask.restype = wintypes.BOOL
+        kernel32.SetProcessAffinityMask.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        kernel32.SetProcessAffinityMask.restype = wintypes.BOOL
+        kernel32.SetPriorityClass.argtypes = [ctypes.c_void_p, wintypes.DWORD]
+        kernel32.SetPriorityClass.restype = wintypes.BOOL
+        return kernel32
+    except Exception as e:
+        logger.debug("Thread affinity unavailable: %s", e)
+        return None
+
+
+_kernel32 = _load_kernel32()
+
+# Process-wide CPU set, captured before any thread is pinned. On Linux a
+# pinned thread's mask is what sched_getaffinity(0) reports afterwards, and
+# threads it starts inherit it, so unpinning needs the original set.
+_process_cpus = set(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+
+
+def available_cpus() -> List[int]:
+    """Return the CPUs this process may run on, in ascending order."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    if _kernel32 is not None:
+        process_mask = ctypes.c_size_t()
+        system_mask = ctypes.c_size_t()
+        if _kernel32.GetProcessAffinityMask(
+            _kernel32.GetCurrentProcess(), ctypes.byref(process_mask), ctypes.byref(system_mask)
+        ):
+            mask = process_mask.value
+            return [cpu for cpu in range(mask.bit_length()) if mask >> cpu & 1]
+    # Affinity masks only address the first 64 CPUs of a group
+    return list(range(min(os.cpu_count() or 1, 64)))
+
+
+def cpu_half(upper: bool) -> List[int]:
+    """
+    Return the lower or upper half of the usable CPUs.
+
+    With fewer than two CPUs both halves are the full set.
+    """
+    cpus = available_cpus()
+    if len(cpus) < 2:
+        return cpus
+    middle = len(cpus) // 2
+    return cpus[middle:] if upper else cpus[:middle]
+
+
+def set_process_affinity(cpus: Iterable[int]) -> bool:
+    """
+    Restrict the current process (and threads it starts later) to cpus.
+
+    Returns:
+        True if the affinity was applied
+    """
+    global _process_cpus
+    cpus = set(cpus)
+    if not cpus:
+        return False
+
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            # Threads inherit the mask when created, so call this early
+            os.sched_setaffinity(0, cpus)
+            _process_cpus = cpus
+        elif _kernel32 is not None:
+            mask = sum(1 << cpu for cpu in cpus)
+            if not _kernel32.SetProcessAffinityMask(_kernel32.GetCurrentProcess(), mask):
+                raise ctypes.WinError(ctypes.get_last_error())
+        else:
+            return False
+    except OSError as e:
+        logger.debug("Could not set process affinity to %s: %s", sorted(cpus), e)
+        return False
+
+    logger.debug("Process restricted to CPUs %s", sorted(cpus))
+    return True
+
+
+def raise_process_priority() -> bool:
+    """Move the current process to above-normal priority (Windows only)."""
+    if _kernel32 is None:
+        return False
+    if not _kernel32.SetPriorityClass(_kernel32.GetCurrentProcess(), ABOVE_NORMAL_PRIORITY_CLASS):
+        logger.debug("Could not raise process priority: %s", ctypes.WinError(ctypes.get_last_error()))
+        return False
+    return True
+
+
+def pin_current_thread(slot: int) -> bool:
+    """
+    Pin the calling thread to one CPU.
+
+    Slots map onto the usable CPUs in order and wrap around, so distinct
+    slots land on distinct cores whenever enough are available. Does
+    nothing on single-core machines.
+
+    Args:
+        slot: Index of the worker (0 = backend loop, 1 = TTS, 2 = wake word)
+
+    Returns:
+        True if the thread was pinned
+    """
+    cpus = available_cpus()
+    if len(cpus) < 2:
+        return False
+    cpu = cpus[slot % len(cpus)]
+
+    try:
+        if hasattr(os, "sched_setaffinity"):
+            # On Linux pid 0 means the calling thread, not the whole process
+            os.sched_setaffinity(0, {cpu})
+        elif _kernel32 is not None:
+            if not _kernel32.SetThreadAffinityMask(_kernel32.GetCurrentThread(), 1 << cpu):
+                raise ctypes.WinError(ctypes.get_last_error())
+        else:
+            return False
+    except OSError as e:
+        # Restricted cpusets in containers, or a CPU outside the process mask
+        logger.debug("Could not pin thread to CPU %s: %s", cpu, e)
+        return False
+
+    logger.debug("Pinned thread to CPU %s", cpu)
+    return True
+
+
+def unpin_current_thread() -> bool:
+    """
+    Let the calling thread run on every CPU the process may use.
+
+    Only needed on Linux, where a thread started by a pinned thread
+    inherits its single-CPU mask; Windows threads start with the process
+    mask. Call it first thing in workers spawned from a pinned thread.
+
+    Returns:
+        True if the thread's affinity was reset
+    """
+    if not _process_cpus or not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        os.sched_setaffinity(0, _process_cpus)
+    except OSError as e:
+        logger.debug("Could not reset thread affinity: %s", e)
+        return False
+    return True
@@ -0,0 +1,46 @@
+"""
+Lazy import helpers for deferring heavyweight module loads.
+"""
+import importlib
+from typing import Any
+
+
+class LazyProxy:
+    """
+    Stand-in for a module-level object that is imported on first attribute access.
+    
+    Lets modules reference singletons like ``input_sim`` without pulling their
+    dependencies (pyautogui, pywinauto, ...) into every importer.
+    """
+    
+    __slots__ = ("_module_name", "_attr_name", "_target")
+    
+    def __init__(self, module_name: str, attr_name: str):
+        """
+        Initialize the proxy.
+        
+        Args:
+            module_name: Dotted module path that defines the object
+            attr_name: Name of the object within that module
+        """
+        object.__setattr__(self, "_module_name", module_name)
+        object.__setattr__(self, "_attr_name", attr_name)
+        object.__setattr__(self, "_target", None)
+    
+    def _resolve(self) -> Any:
+        """Import the module and cache the target object."""
+        target = self._target
+        if target is None:
+            module = importlib.import_module(self._module_name)
+            target = getattr(module, self._attr_name)
+            object.__setattr__(self, "_target", target)
+        return target
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+    
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._resolve(), name, value)
+    
+    def __repr__(self) -> str:
+        return f"<LazyProxy {self._module_name}.{self._attr_name}>"
@@ -1,11 +1,19 @@
 """
 Centralized logging configuration with rotating file handlers.
+
+Loggers only enqueue records; console and file output is written by a
+background QueueListener so disk I/O never blocks the caller.
 """
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 import sys
 
+# Listeners started by setup_logging, stopped (and flushed) by stop_logging
+_listeners = []
+
 
 def setup_logging(name: str, log_file: str = None, level: int = logging.INFO) -> logging.Logger:
     """
@@ -37,11 +45,13 @@ def setup_logging(name: str, log_file: str = None, level: int = logging.INFO) ->
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
+    handlers = []
+    
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler (rotating)
     if log_file:
@@ -54,11 +64,28 @@ def setup_logging(name: str, log_file: str = None, level: int = logging.INFO) ->
         )
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # The logger only enqueues; the listener thread does the writing
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
     
     return logger
 
 
+def stop_logging():
+    """Flush queued records and stop all listener threads."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+# Child processes skip atexit, so process entrypoints also call stop_logging()
+atexit.register(stop_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get an existing logger or create a new one.
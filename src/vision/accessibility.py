@@ -2,10 +2,14 @@
 Accessibility Inspector - Inspects UI elements using Windows UI Automation.
 """
 import logging
+import time
 from typing import List, Dict, Any, Optional, Tuple
 
 logger = logging.getLogger("Accessibility")
 
+WM_NULL = 0x0000
+SMTO_ABORTIFHUNG = 0x0002
+
 
 class AccessibilityInspector:
     """Inspects UI elements using Windows UI Automation."""
@@ -47,11 +51,11 @@ class AccessibilityInspector:
                 
                 return [self._element_to_dict(element)]
             except Exception as e:
-                logger.debug(f"Could not get element at ({x}, {y}): {e}")
+                logger.debug("Could not get element at (%s, %s): %s", x, y, e)
                 return []
                 
         except Exception as e:
-            logger.error(f"Error getting elements: {e}")
+            logger.error("Error getting elements: %s", e)
             return []
     
     def get_window_elements(self, window_title: str = None) -> List[Dict[str, Any]]:
@@ -78,7 +82,7 @@ class AccessibilityInspector:
                 try:
                     window = desktop.window(title_re=f".*{window_title}.*")
                 except ElementNotFoundError:
-                    logger.warning(f"Window not found: {window_title}")
+                    logger.warning("Window not found: %s", window_title)
                     return []
             else:
                 # Get foreground window
@@ -97,15 +101,28 @@ class AccessibilityInspector:
                         elements.append(elem_dict)
                 
             except Exception as e:
-                logger.debug(f"Error getting descendants: {e}")
+                logger.debug("Error getting descendants: %s", e)
             
-            logger.info(f"Found {len(elements)} UI elements")
+            logger.info("Found %s UI elements", len(elements))
             return elements
             
         except Exception as e:
-            logger.error(f"Error getting window elements: {e}")
+            logger.error("Error getting window elements: %s", e)
             return []
     
+    def get_foreground_handle(self) -> Optional[int]:
+        """
+        Get the handle of the foreground window.
+        
+        Returns:
+            Window handle, or None if it can't be determined
+        """
+        try:
+            import ctypes
+            return ctypes.windll.user32.GetForegroundWindow() or None
+        except (ImportError, AttributeError, OSError):
+            return None
+    
     def _element_to_dict(self, element) -> Optional[Dict[str, Any]]:
         """Convert UI element to dictionary."""
         try:
@@ -128,7 +145,7 @@ class AccessibilityInspector:
             return elem_dict
             
         except Exception as e:
-            logger.debug(f"Error converting element: {e}")
+            logger.debug("Error converting element: %s", e)
             return None
     
     def find_element_by_name(self, name: str, window_title: str = None) -> Optional[Dict[str, Any]]:
@@ -173,6 +190,44 @@ class AccessibilityInspector:
         
         return buttons
     
+    def wait_for_idle(self, timeout: float = 0.5) -> bool:
+        """
+        Wait until the foreground window is processing messages again.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            True if the window responded before the timeout
+        """
+        try:
+            import ctypes
+            from ctypes import wintypes
+            user32 = ctypes.windll.user32
+        except (ImportError, AttributeError):
+            # No Win32 API available: fall back to a fixed settle delay
+            time.sleep(timeout)
+            return False
+        
+        deadline = time.monotonic() + timeout
+        backoff = 0.01
+        result = wintypes.DWORD()
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            
+            hwnd = user32.GetForegroundWindow()
+            if hwnd and user32.SendMessageTimeoutW(
+                hwnd, WM_NULL, 0, 0, SMTO_ABORTIFHUNG,
+                max(1, int(remaining * 1000)), ctypes.byref(result)
+            ):
+                return True
+            
+            time.sleep(min(backoff, remaining))
+            backoff *= 2
+    
     def click_element(self, element: Dict[str, Any]) -> bool:
         """
         Click on an element.
@@ -191,13 +246,13 @@ class AccessibilityInspector:
             
             if x > 0 and y > 0:
                 pyautogui.click(x, y)
-                logger.info(f"Clicked element: {element.get('name')}")
+                logger.info("Clicked element: %s", element.get('name'))
                 return True
             
             return False
             
         except Exception as e:
-            logger.error(f"Error clicking element: {e}")
+            logger.error("Error clicking element: %s", e)
             return False
 
 
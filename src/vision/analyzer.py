@@ -65,7 +65,7 @@ class VisionAnalyzer:
                 }
             ]
             
-            logger.info(f"Analyzing screenshot with prompt: {prompt}")
+            logger.info("Analyzing screenshot with prompt: %s", prompt)
             
             # Get response
             response = self.llm.chat(messages)
@@ -73,7 +73,7 @@ class VisionAnalyzer:
             return response
             
         except Exception as e:
-            logger.error(f"Error analyzing screenshot: {e}")
+            logger.error("Error analyzing screenshot: %s", e)
             return ""
     
     def find_element_in_screenshot(self, element_description: str) -> Optional[Dict[str, Any]]:
@@ -118,12 +118,12 @@ Be precise with the coordinates."""
             if data.get("found", False):
                 return data
             else:
-                logger.warning(f"Element not found: {element_description}")
+                logger.warning("Element not found: %s", element_description)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error parsing vision response: {e}")
-            logger.debug(f"Response was: {response}")
+            logger.error("Error parsing vision response: %s", e)
+            logger.debug("Response was: %s", response)
             return None
     
     def describe_screen(self) -> str:
@@ -175,7 +175,7 @@ For each element, return JSON like:
             return data.get("elements", [])
             
         except Exception as e:
-            logger.error(f"Error parsing elements: {e}")
+            logger.error("Error parsing elements: %s", e)
             return []
 
 
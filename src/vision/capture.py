@@ -28,7 +28,7 @@ class ScreenCapture:
             logger.error("mss not installed. Install with: pip install mss")
             self.sct = None
         except Exception as e:
-            logger.error(f"Error initializing screen capture: {e}")
+            logger.error("Error initializing screen capture: %s", e)
             self.sct = None
     
     def capture_screen(self, monitor: int = 1) -> Optional[np.ndarray]:
@@ -56,11 +56,11 @@ class ScreenCapture:
             img = img[:, :, :3]
             img = img[:, :, ::-1]  # BGR to RGB
             
-            logger.debug(f"Captured screen: {img.shape}")
+            logger.debug("Captured screen: %s", img.shape)
             return img
             
         except Exception as e:
-            logger.error(f"Error capturing screen: {e}")
+            logger.error("Error capturing screen: %s", e)
             return None
     
     def capture_region(self, x: int, y: int, width: int, height: int) -> Optional[np.ndarray]:
@@ -89,7 +89,7 @@ class ScreenCapture:
             return img
             
         except Exception as e:
-            logger.error(f"Error capturing region: {e}")
+            logger.error("Error capturing region: %s", e)
             return None
     
     def save_screenshot(self, filename: str = None, monitor: int = 1) -> str:
@@ -118,12 +118,12 @@ class ScreenCapture:
             
             # Save
             Image.fromarray(img).save(filename)
-            logger.info(f"Screenshot saved: {filename}")
+            logger.info("Screenshot saved: %s", filename)
             
             return filename
             
         except Exception as e:
-            logger.error(f"Error saving screenshot: {e}")
+            logger.error("Error saving screenshot: %s", e)
             return ""
     
     def get_screen_size(self, monitor: int = 1) -> Tuple[int, int]:
@@ -49,7 +49,7 @@ class FileSystemWatcher:
         try:
             watch_path = Path(path)
             if not watch_path.exists():
-                logger.error(f"Watch path does not exist: {path}")
+                logger.error("Watch path does not exist: %s", path)
                 return False
             
             # Create custom event handler
@@ -70,11 +70,11 @@ class FileSystemWatcher:
                 self.observer.start()
                 self.running = True
             
-            logger.info(f"Started watching directory: {path} (recursive={recursive})")
+            logger.info("Started watching directory: %s (recursive=%s)", path, recursive)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to watch directory '{path}': {e}")
+            logger.error("Failed to watch directory '%s': %s", path, e)
             return False
     
     def stop_watching(self, path: str) -> bool:
@@ -91,13 +91,13 @@ class FileSystemWatcher:
             if path in self.handlers:
                 # Remove the handler
                 del self.handlers[path]
-                logger.info(f"Stopped watching directory: {path}")
+                logger.info("Stopped watching directory: %s", path)
                 return True
             else:
-                logger.warning(f"No active watch found for: {path}")
+                logger.warning("No active watch found for: %s", path)
                 return False
         except Exception as e:
-            logger.error(f"Failed to stop watching '{path}': {e}")
+            logger.error("Failed to stop watching '%s': %s", path, e)
             return False
     
     def stop_all(self):
@@ -169,32 +169,32 @@ class CustomFileHandler(FileSystemEventHandler):
     def on_created(self, event: FileSystemEvent):
         """Called when a file or directory is created."""
         if not event.is_directory and self._matches_pattern(event.src_path):
-            logger.info(f"File created: {event.src_path}")
+            logger.info("File created: %s", event.src_path)
             if self.on_created_callback:
                 try:
                     self.on_created_callback(event.src_path)
                 except Exception as e:
-                    logger.error(f"Error in on_created callback: {e}")
+                    logger.error("Error in on_created callback: %s", e)
     
     def on_modified(self, event: FileSystemEvent):
         """Called when a file or directory is modified."""
         if not event.is_directory and self._matches_pattern(event.src_path):
-            logger.debug(f"File modified: {event.src_path}")
+            logger.debug("File modified: %s", event.src_path)
             if self.on_modified_callback:
                 try:
                     self.on_modified_callback(event.src_path)
                 except Exception as e:
-                    logger.error(f"Error in on_modified callback: {e}")
+                    logger.error("Error in on_modified callback: %s", e)
     
     def on_deleted(self, event: FileSystemEvent):
         """Called when a file or directory is deleted."""
         if not event.is_directory and self._matches_pattern(event.src_path):
-            logger.info(f"File deleted: {event.src_path}")
+            logger.info("File deleted: %s", event.src_path)
             if self.on_deleted_callback:
                 try:
                     self.on_deleted_callback(event.src_path)
                 except Exception as e:
-                    logger.error(f"Error in on_deleted callback: {e}")
+                    logger.error("Error in on_deleted callback: %s", e)
     
     def on_moved(self, event: FileSystemEvent):
         """Called when a file or directory is moved."""
@@ -203,12 +203,12 @@ class CustomFileHandler(FileSystemEventHandler):
             dest_matches = self._matches_pattern(event.dest_path) if hasattr(event, 'dest_path') else False
             
             if src_matches or dest_matches:
-                logger.info(f"File moved: {event.src_path} -> {event.dest_path}")
+                logger.info("File moved: %s -> %s", event.src_path, event.dest_path)
                 if self.on_moved_callback and hasattr(event, 'dest_path'):
                     try:
                         self.on_moved_callback(event.src_path, event.dest_path)
                     except Exception as e:
-                        logger.error(f"Error in on_moved callback: {e}")
+                        logger.error("Error in on_moved callback: %s", e)
 
 
 # Global file system watcher instance